@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the ORBYA Portfolio API.
+
+Runs ``server:app`` in-process on one of the storage backends that need no
+outside service (in-memory by default, SQLite, or a mongomock stand-in for
+MongoDB) and drives a weighted mix of read and upload traffic through it. Reports
+p50/p95/p99 latency per scenario plus overall throughput, and exits non-zero
+when a run regresses against a stored baseline.
+
+    python backend/benchmarks/run_benchmark.py                  # compare with baseline.json
+    python backend/benchmarks/run_benchmark.py --save-baseline  # record a new baseline
+
+The server runs from a temporary copy of backend/, so uploads and data/*.json
+writes never touch the working tree.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# (name, weight) - roughly the traffic a portfolio visit generates
+SCENARIOS = [
+    ("projects", 30),
+    ("projects_featured", 10),
+    ("project_detail", 10),
+    ("skills", 15),
+    ("quote", 15),
+    ("media", 15),
+    ("upload", 5),
+]
+
+
+def load_server(workdir: Path, storage: str):
+    """Import server.py from a scratch copy of backend/ running on ``storage``"""
+    shutil.copytree(
+        BACKEND_DIR, workdir / "backend",
+        ignore=shutil.ignore_patterns("__pycache__", "tests", "benchmarks", "uploads"),
+    )
+    (workdir / "backend" / "static" / "uploads").mkdir(parents=True, exist_ok=True)
+    os.environ["STORAGE_BACKEND"] = "mongo" if storage == "mongomock" else storage
+    os.environ["SQLITE_PATH"] = str(workdir / "benchmark.db")
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "benchmark")
+    sys.path.insert(0, str(workdir / "backend"))
+
+    import server
+
+    if storage == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+        from storage import MongoStorage
+
+        server.storage = MongoStorage(AsyncMongoMockClient()[os.environ["DB_NAME"]])
+    return server
+
+
+def make_images(count: int, seed: int) -> list:
+    """Small deterministic PNGs; a few distinct ones so uploads exercise deduplication too"""
+    rng = random.Random(seed)
+    images = []
+    for _ in range(count):
+        color = tuple(rng.randrange(256) for _ in range(3))
+        buffer = io.BytesIO()
+        Image.new("RGB", (640, 360), color).save(buffer, "PNG")
+        images.append(buffer.getvalue())
+    return images
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Benchmark:
+    def __init__(self, server, storage: str, requests: int, concurrency: int, warmup: int, seed: int):
+        self.server = server
+        self.storage = storage
+        self.requests = requests
+        self.concurrency = concurrency
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.images = make_images(8, seed)
+        self.project_ids = []
+        self.latencies = {name: [] for name, _ in SCENARIOS}
+        self.errors = {name: 0 for name, _ in SCENARIOS}
+
+    async def call(self, client: httpx.AsyncClient, scenario: str, rng: random.Random) -> httpx.Response:
+        if scenario == "projects":
+            return await client.get("/api/projects")
+        if scenario == "projects_featured":
+            return await client.get("/api/projects", params={"featured": "true", "limit": 3, "fields": "title,thumbnail"})
+        if scenario == "project_detail":
+            return await client.get(f"/api/projects/{rng.choice(self.project_ids)}")
+        if scenario == "skills":
+            return await client.get("/api/skills")
+        if scenario == "quote":
+            return await client.get("/api/quote")
+        if scenario == "media":
+            return await client.get("/api/media", params={"limit": 50})
+        if scenario == "upload":
+            image = rng.choice(self.images)
+            return await client.post("/api/upload", files={"file": ("bench.png", image, "image/png")})
+        raise ValueError(scenario)
+
+    def plan(self, count: int) -> list:
+        names = [name for name, _ in SCENARIOS]
+        weights = [weight for _, weight in SCENARIOS]
+        return self.rng.choices(names, weights, k=count)
+
+    async def drive(self, client: httpx.AsyncClient, plan: list, record: bool) -> None:
+        queue = asyncio.Queue()
+        for item in plan:
+            queue.put_nowait(item)
+
+        async def worker(worker_seed):
+            rng = random.Random(worker_seed)
+            while not queue.empty():
+                scenario = queue.get_nowait()
+                started = time.perf_counter()
+                response = await self.call(client, scenario, rng)
+                elapsed = time.perf_counter() - started
+                if not record:
+                    continue
+                self.latencies[scenario].append(elapsed)
+                if response.status_code >= 400:
+                    self.errors[scenario] += 1
+
+        await asyncio.gather(*(worker(self.rng.random()) for _ in range(self.concurrency)))
+
+    async def run(self) -> dict:
+        app = self.server.app
+        for handler in app.router.on_startup:
+            await handler()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                projects = (await client.get("/api/projects")).json()
+                self.project_ids = [p["id"] for p in projects] or [1]
+
+                await self.drive(client, self.plan(self.warmup), record=False)
+                started = time.perf_counter()
+                await self.drive(client, self.plan(self.requests), record=True)
+                wall = time.perf_counter() - started
+        finally:
+            for handler in app.router.on_shutdown:
+                await handler()
+        return self.report(wall)
+
+    def report(self, wall: float) -> dict:
+        scenarios = {}
+        for name, values in self.latencies.items():
+            values = sorted(values)
+            scenarios[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+            }
+        return {
+            "config": {
+                "storage": self.storage,
+                "requests": self.requests,
+                "concurrency": self.concurrency,
+                "warmup": self.warmup,
+            },
+            "throughput_rps": round(self.requests / wall, 1) if wall else 0.0,
+            "scenarios": scenarios,
+        }
+
+
+def compare(result: dict, baseline: dict, tolerance: float, slack_ms: float) -> list:
+    """Regressions of ``result`` against ``baseline``.
+
+    Latencies may grow by ``tolerance`` (0.3 = 30%) plus ``slack_ms``, so
+    sub-millisecond scenarios do not flap on scheduler noise. p99 is
+    reported but not gated: a few hundred samples make it too noisy.
+    """
+    problems = []
+    floor = baseline["throughput_rps"] * (1 - tolerance)
+    if result["throughput_rps"] < floor:
+        problems.append(f"throughput {result['throughput_rps']} rps < {floor:.1f} rps")
+    for name, stats in result["scenarios"].items():
+        if stats["errors"]:
+            problems.append(f"{name}: {stats['errors']} error responses")
+        base = baseline["scenarios"].get(name)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            ceiling = base[key] * (1 + tolerance) + slack_ms
+            if stats[key] > ceiling:
+                problems.append(f"{name}: {key} {stats[key]} > {ceiling:.3f}")
+    return problems
+
+
+def print_report(result: dict) -> None:
+    print(f"{'scenario':<20}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, stats in result["scenarios"].items():
+        print(f"{name:<20}{stats['requests']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>8}")
+    print(f"\nThroughput: {result['throughput_rps']} req/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--storage", choices=["memory", "sqlite", "mongomock"], default="memory")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown before failing (fraction)")
+    parser.add_argument("--slack-ms", type=float, default=1.0, help="Absolute latency slack added to each limit")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline instead of comparing")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="portfolio-bench-") as workdir:
+        server = load_server(Path(workdir), args.storage)
+        bench = Benchmark(server, args.storage, args.requests, args.concurrency, args.warmup, args.seed)
+        result = asyncio.run(bench.run())
+
+    print_report(result)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("config") != result["config"]:
+        print("⚠️  Baseline was recorded with a different configuration; comparison may be meaningless")
+    problems = compare(result, baseline, args.tolerance, args.slack_ms)
+    if problems:
+        print("\n❌ Regressions against baseline:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
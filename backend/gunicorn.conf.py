@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for running the API on several worker processes.
+
+    cd backend && gunicorn server:app -c gunicorn.conf.py
+
+Each worker is a uvicorn event loop with its own in-process caches. Writes
+to data/*.json take a file lock, and every write bumps a shared generation
+counter so the other workers drop their caches (see ``WorkerGenerations`` in
+server.py). Storage must be shared between processes: STORAGE_BACKEND=mongo
+or sqlite. With the in-memory backend every worker has its own data.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8001")
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2, 8)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Tells server.py to share cache invalidations between the workers
+raw_env = ["MULTI_WORKER=true"]
+
+# Let in-flight uploads and write-behind flushes finish on restart
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
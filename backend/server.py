@@ -1,18 +1,52 @@
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Mount
 from dotenv import load_dotenv
+from PIL import Image
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from collections import OrderedDict, deque
+from pymongo import DESCENDING
+from pymongo import monitoring
+from bson import json_util
 import os
+import asyncio
+import fcntl
 import logging
-import shutil
+import mmap
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, TypeAdapter
+from typing import List, NamedTuple, Optional
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from storage import INBOX_SORT, STORAGE_BACKENDS, MongoStorage, RecordFilter, StorageUnavailable, open_storage
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import random
+import base64
+import bisect
+import gzip
+import heapq
+import itertools
+import math
+import hashlib
 import json
+import mimetypes
+import struct
+import time
+from contextlib import contextmanager
+from email.utils import formatdate, parsedate_to_datetime
+import anyio
+import stat
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
 
 
 ROOT_DIR = Path(__file__).parent
@@ -22,23 +56,443 @@ load_dotenv(ROOT_DIR / '.env')
 UPLOADS_DIR = ROOT_DIR / "static" / "uploads"
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Data directory for the JSON content files
+DATA_DIR = ROOT_DIR / "data"
+
+
+# Dedicated pool for data/*.json and catalog file I/O, so a slow disk never blocks the event loop
+data_io = ThreadPoolExecutor(max_workers=4, thread_name_prefix="data-io")
+
+
+async def run_io(func, *args):
+    """Run blocking file work on the data I/O pool"""
+    return await asyncio.get_running_loop().run_in_executor(data_io, func, *args)
+
+
+# mkstemp creates files as 0600; files renamed into place get the mode open() would give them.
+# Read once at import, since os.umask can only be read by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive lock on ``path`` shared by every worker process, held through a ``.<name>.lock`` sibling"""
+    with open(path.parent / f".{path.name}.lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _atomic_write_json(path: Path, data) -> None:
+    """Write JSON to a temp file next to ``path``, fsync it and rename it over ``path``"""
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            os.fchmod(f.fileno(), FILE_MODE)
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _read_json(path: Path):
+    """Parse ``path`` and return ``(signature, data)``; the stat is taken from the open file"""
+    with open(path, 'r') as f:
+        signature = DocumentCache._signature(os.fstat(f.fileno()))
+        started = time.perf_counter()
+        data = json.load(f)
+    json_parse_seconds.observe(time.perf_counter() - started, path.name)
+    return signature, data
+
+
+class DocumentCache:
+    """Parsed JSON documents from a directory, revalidated against each file's stat.
+
+    Reads return the cached object until the file's mtime, size or inode
+    changes; ``write`` updates the file and the cache together so the next
+    read is a hit. Values computed from a document with ``derive`` are kept
+    alongside it and dropped with it. Returned objects are shared, so
+    callers must copy before mutating.
+
+    Parsing and writing happen on the ``data_io`` pool. Writes go through a
+    temp file and rename, and are serialized per file by an asyncio lock
+    within the process and ``_file_lock`` across worker processes;
+    ``update`` holds both across a read-modify-write. The rename gives each
+    write a new inode, so other workers' caches miss on their next read.
+    The ``*_sync`` variants are for code that already runs on a worker thread.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._entries = {}
+        self._locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(stat_result) -> tuple:
+        return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+    def lock(self, name: str) -> asyncio.Lock:
+        if name not in self._locks:
+            self._locks[name] = asyncio.Lock()
+        return self._locks[name]
+
+    def _cached(self, name: str):
+        """``(hit, data)`` from a stat check alone; a stat is cheap enough to stay inline"""
+        try:
+            signature = self._signature((self.directory / name).stat())
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            return True, None
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            return True, entry[1]
+        return False, None
+
+    def _store(self, name: str, signature: tuple, data) -> None:
+        self.misses += 1
+        self._entries[name] = (signature, data, {})
+
+    async def load(self, name: str, default=None):
+        """Return the parsed contents of ``name``, or ``default`` if it is missing"""
+        hit, data = self._cached(name)
+        if not hit:
+            try:
+                signature, data = await run_io(_read_json, self.directory / name)
+            except FileNotFoundError:
+                return default
+            self._store(name, signature, data)
+        return default if data is None else data
+
+    def load_sync(self, name: str, default=None):
+        hit, data = self._cached(name)
+        if not hit:
+            try:
+                signature, data = _read_json(self.directory / name)
+            except FileNotFoundError:
+                return default
+            self._store(name, signature, data)
+        return default if data is None else data
+
+    async def derive(self, name: str, key: str, build, default=None):
+        """Return ``build(data)`` for the current version of ``name``, computing it once"""
+        data = await self.load(name, default)
+        entry = self._entries.get(name)
+        if entry is None or entry[1] is not data:
+            return build(data)
+        derived = entry[2]
+        if key not in derived:
+            derived[key] = build(data)
+        return derived[key]
+
+    def _write_locked(self, name: str, data) -> None:
+        path = self.directory / name
+        _atomic_write_json(path, data)
+        self._entries[name] = (self._signature(path.stat()), data, {})
+
+    def _write(self, name: str, data) -> None:
+        with _file_lock(self.directory / name):
+            self._write_locked(name, data)
+
+    def _update(self, name: str, modify, default):
+        with _file_lock(self.directory / name):
+            # Re-validated under the lock, so another worker's write is seen
+            data = modify(self.load_sync(name, default))
+            self._write_locked(name, data)
+        return data
+
+    async def write(self, name: str, data) -> None:
+        """Write ``data`` to ``name`` and prime the cache with it"""
+        async with self.lock(name):
+            await run_io(self._write, name, data)
+
+    def write_sync(self, name: str, data, locked: bool = False) -> None:
+        """``locked=True`` when the caller already holds ``_file_lock`` for ``name``"""
+        if locked:
+            self._write_locked(name, data)
+        else:
+            self._write(name, data)
+
+    async def update(self, name: str, modify, default=None):
+        """Read ``name``, apply ``modify`` and write the result, all under the file's locks.
+
+        ``modify`` receives the current contents (or ``default``) and must
+        return the new document without mutating its argument. It runs on
+        the ``data_io`` pool while the cross-process lock is held.
+        """
+        async with self.lock(name):
+            return await run_io(self._update, name, modify, default)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "documents": sorted(self._entries),
+        }
+
+
+documents = DocumentCache(DATA_DIR)
+
+
+def _index_by_id(records) -> dict:
+    return {record["id"]: record for record in records or []}
+
+
+async def _record_index(name: str) -> dict:
+    """id -> record map for a JSON list document, rebuilt only when the file changes"""
+    return await documents.derive(name, "by_id", _index_by_id, [])
+
+# Metrics: in-process counters and histograms, rendered in the Prometheus
+# text format at /metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Cumulative latency histogram per label set; safe to observe from any thread"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        names = self.labelnames + ("le",)
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        self.inc(-amount)
+
+    def samples(self):
+        yield f"{self.name} {self.value}"
+
+
+class CallbackMetric:
+    """A counter or gauge whose ``(label values, value)`` pairs are read from ``collect`` at scrape time"""
+
+    def __init__(self, name: str, kind: str, help: str, labelnames, collect):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in self.collect():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+http_request_seconds = metrics.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"),
+))
+http_in_flight = metrics.register(Gauge("http_requests_in_flight", "HTTP requests currently being served"))
+mongo_command_seconds = metrics.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time", ("command", "outcome"),
+))
+json_parse_seconds = metrics.register(Histogram(
+    "json_parse_duration_seconds", "Time spent parsing data/*.json documents", ("document",),
+))
+json_serialize_seconds = metrics.register(Histogram(
+    "json_serialize_duration_seconds", "Time spent encoding JSON response bodies",
+))
+
+# name -> object with ``hits`` and ``misses`` counters
+tracked_caches = {}
+
+
+def track_cache(name: str, cache) -> None:
+    tracked_caches[name] = cache
+
+
+def _cache_ratios():
+    for name, cache in sorted(tracked_caches.items()):
+        lookups = cache.hits + cache.misses
+        yield (name,), round(cache.hits / lookups, 4) if lookups else 0.0
+
+
+metrics.register(CallbackMetric(
+    "cache_hits_total", "counter", "Cache hits", ("cache",),
+    lambda: (((name,), cache.hits) for name, cache in sorted(tracked_caches.items())),
+))
+metrics.register(CallbackMetric(
+    "cache_misses_total", "counter", "Cache misses", ("cache",),
+    lambda: (((name,), cache.misses) for name, cache in sorted(tracked_caches.items())),
+))
+metrics.register(CallbackMetric("cache_hit_ratio", "gauge", "Cache hit ratio", ("cache",), _cache_ratios))
+track_cache("documents", documents)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Feeds driver-reported command durations into ``mongo_command_seconds``"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongo_command_seconds.observe(event.duration_micros / 1e6, event.command_name, "success")
+
+    def failed(self, event):
+        mongo_command_seconds.observe(event.duration_micros / 1e6, event.command_name, "failure")
+
+
+class MetricsMiddleware:
+    """Time every HTTP request and label it with the matched route's path template.
+
+    The template (``/api/projects/{project_id}``) rather than the raw path
+    keeps the number of series bounded; requests that match no route are
+    counted under ``unmatched``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates = None
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._templates is None:
+            templates = {}
+            for route in scope["app"].routes:
+                if isinstance(route, Mount):
+                    templates[route.app] = route.path + "/{path}"
+                else:
+                    templates[route.endpoint] = route.path
+            self._templates = templates
+        return self._templates.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            http_request_seconds.observe(
+                time.perf_counter() - started, scope["method"], self._route(scope), str(status)
+            )
+
+
+# Storage: MongoDB by default; "sqlite" or "memory" run without a Mongo server
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+if STORAGE_BACKEND not in STORAGE_BACKENDS:
+    raise RuntimeError(f"STORAGE_BACKEND must be one of {', '.join(STORAGE_BACKENDS)}")
+storage = open_storage(
+    STORAGE_BACKEND,
+    mongo_url=os.environ.get('MONGO_URL'),
+    db_name=os.environ.get('DB_NAME'),
+    sqlite_path=Path(os.environ.get('SQLITE_PATH', DATA_DIR / "portfolio.db")),
+    event_listeners=[MongoCommandMetrics()],
+)
 
 # Create the main app without a prefix
 app = FastAPI()
 
-# Mount static files for uploads
-app.mount("/static", StaticFiles(directory=str(ROOT_DIR / "static")), name="static")
-
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of the metrics registry"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
@@ -116,31 +570,647 @@ class SkillCreate(BaseModel):
     icon: Optional[str] = ""
 
 
+ProjectList = TypeAdapter(List[Project])
+SkillList = TypeAdapter(List[Skill])
+
+
+# Pre-serialized JSON responses
+class JsonBody(NamedTuple):
+    content: bytes
+    etag: str
+
+
+def _make_body(payload, adapter: Optional[TypeAdapter] = None) -> JsonBody:
+    """Encode a payload once, validating it through ``adapter`` when given"""
+    started = time.perf_counter()
+    if adapter is not None:
+        content = adapter.dump_json(adapter.validate_python(payload))
+    else:
+        content = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    json_serialize_seconds.observe(time.perf_counter() - started)
+    return JsonBody(content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+
+
+async def _document_body(name: str, default=None, adapter: Optional[TypeAdapter] = None, transform=None) -> JsonBody:
+    """Serialized body for a data/*.json document, computed once per file version"""
+    def build(data):
+        return _make_body(transform(data) if transform else data, adapter)
+    return await documents.derive(name, "body", build, default)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_strip_encoding(tag.strip().removeprefix("W/")) == etag for tag in header.split(","))
+
+
+# Content-Encoding negotiation
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = {"application/json", "application/javascript", "application/xml", "image/svg+xml"}
+PRECOMPRESS_SUFFIXES = {".pdf", ".svg", ".json", ".txt", ".html", ".css", ".js"}
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _accepted_encodings(accept_encoding: str) -> List[str]:
+    """Encodings we can produce that the client accepts, best first"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return [e for e in supported if weights.get(e, weights.get("*", 0.0)) > 0]
+
+
+def _compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6)
+
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    """ETag for the ``encoding`` representation of a response; strong ETags must differ per encoding"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _strip_encoding(etag: str) -> str:
+    for encoding in ENCODING_SUFFIXES:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    """Brotli/gzip-compress text and JSON responses of a known length above ``minimum_size``.
+
+    Streaming responses (no Content-Length), partial content and bodies
+    that already carry a Content-Encoding pass through untouched.
+    Compressed bodies of responses with an ETag are kept in a small LRU,
+    so each version of a payload is compressed once per encoding. Large
+    bodies are compressed on the threadpool, so the LRU is guarded by a lock.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, cache_size: int = 256):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        track_cache("compression", self)
+
+    def _compressed(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        if etag is None:
+            return _compress(body, encoding)
+        key = (etag, encoding)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return cached
+            self.misses += 1
+        # Compress outside the lock; two threads racing on one key both store the same bytes
+        compressed = _compress(body, encoding)
+        with self._cache_lock:
+            self._cache[key] = compressed
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compressed
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encodings = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        if not encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = encodings[0]
+        
+        start = None
+        chunks = []
+        passthrough = False
+        
+        async def compressing_send(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if message["status"] == 304 and etag:
+                    # Revalidating a compressed copy: answer with the ETag the client holds
+                    encoded = _encoded_etag(etag, encoding)
+                    if encoded in request_headers.get("if-none-match", ""):
+                        headers["ETag"] = encoded
+                length = headers.get("content-length")
+                if (
+                    message["status"] != 200
+                    or "content-encoding" in headers
+                    or length is None
+                    or int(length) < self.minimum_size
+                    or not _is_compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            etag = headers.get("etag")
+            if len(body) > 64 * 1024:
+                compressed = await run_in_threadpool(self._compressed, body, encoding, etag)
+            else:
+                compressed = self._compressed(body, encoding, etag)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            if etag:
+                headers["ETag"] = _encoded_etag(etag, encoding)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+        
+        await self.app(scope, receive, compressing_send)
+
+
+def _precompressed_sibling(path: Path, stat_result, encoding: str):
+    """A fresh ``.br``/``.gz`` copy of ``path`` and its stat, if one exists"""
+    sibling = path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+    try:
+        sibling_stat = sibling.stat()
+    except FileNotFoundError:
+        return None
+    if sibling_stat.st_mtime_ns < stat_result.st_mtime_ns:
+        return None
+    return sibling, sibling_stat
+
+
+def _precompress_file(path: Path) -> None:
+    """Write ``.br`` and ``.gz`` siblings of a compressible file; kept only when they save 10%"""
+    try:
+        data = path.read_bytes()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if encoding == "br" and brotli is None:
+                continue
+            compressed = _compress(data, encoding, best=True)
+            target = path.with_name(path.name + suffix)
+            if len(compressed) > len(data) * 0.9:
+                target.unlink(missing_ok=True)
+                continue
+            temp = target.with_name(f".{target.name}.part")
+            temp.write_bytes(compressed)
+            os.replace(temp, target)
+    except Exception as e:
+        logger.warning("Could not precompress %s: %s", path.name, e)
+
+
+def _precompress_tree(root: Path) -> None:
+    """Precompress every compressible file under ``root`` whose siblings are missing or stale"""
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(directory) / filename
+            if path.suffix.lower() not in PRECOMPRESS_SUFFIXES or filename.startswith("."):
+                continue
+            st = path.stat()
+            if not all(_precompressed_sibling(path, st, e) for e in ENCODING_SUFFIXES if e != "br" or brotli):
+                _precompress_file(path)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a fresh ``.br``/``.gz`` sibling when the client accepts it"""
+
+    async def get_response(self, path: str, scope) -> Response:
+        headers = Headers(scope=scope)
+        if scope["method"] in ("GET", "HEAD") and "range" not in headers:
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                for encoding in _accepted_encodings(headers.get("accept-encoding", "")):
+                    sibling = await anyio.to_thread.run_sync(
+                        _precompressed_sibling, Path(full_path), stat_result, encoding
+                    )
+                    if sibling is None:
+                        continue
+                    response = self.file_response(str(sibling[0]), sibling[1], scope)
+                    response.headers["Content-Type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                    response.headers["Content-Encoding"] = encoding
+                    response.headers.add_vary_header("Accept-Encoding")
+                    return response
+        return await super().get_response(path, scope)
+
+
+# Mount static files for uploads
+app.mount("/static", PrecompressedStaticFiles(directory=str(ROOT_DIR / "static")), name="static")
+
+
+def _json_response(request: Request, body: JsonBody, extra_headers: Optional[dict] = None) -> Response:
+    """Return ``body`` as-is, or 304 when the client already has this version"""
+    headers = {"ETag": body.etag, "Cache-Control": "no-cache", **(extra_headers or {})}
+    if _etag_matches(request, body.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body.content, media_type="application/json", headers=headers)
+
+
+# File responses with validators and byte-range support
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+FILE_CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 16
+
+
+def _parse_range(header: str, size: int) -> Optional[List[tuple]]:
+    """Parse a ``Range: bytes=...`` header into inclusive ``(start, end)`` pairs.
+
+    Returns None when the header is malformed or asks for too many ranges
+    (the caller serves the whole file), and an empty list when no range
+    overlaps the file (416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+    ranges = []
+    for part in spec.split(","):
+        first, sep, last = part.strip().partition("-")
+        # Every bound given must be a plain number, and at least one is required
+        if not sep or not (first or last) or not all(b.isascii() and b.isdigit() for b in (first, last) if b):
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            # Nothing to serve from an empty file
+            if length == 0 or size == 0:
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+        if start < size:
+            ranges.append((start, end))
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+
+async def _iter_file_range(path: Path, start: int, end: int):
+    async with await anyio.open_file(path, mode="rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def _iter_multipart_ranges(path: Path, parts: List[tuple], boundary: str):
+    for header, (start, end) in parts:
+        yield header
+        async for chunk in _iter_file_range(path, start, end):
+            yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def _not_modified_since(request: Request, mtime: float) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header or "if-none-match" in request.headers:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def _file_response(
+    request: Request,
+    path: Path,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = "no-cache",
+    headers: Optional[dict] = None,
+) -> Response:
+    """Serve ``path`` with ETag/Last-Modified validators and Range support.
+
+    Answers 304 for matching If-None-Match / If-Modified-Since, 206 for one
+    range, 206 multipart/byteranges for several, and 416 when no requested
+    range is satisfiable. If-Range falls back to the full file when stale.
+    """
+    st = path.stat()
+    media_type = media_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+    last_modified = formatdate(st.st_mtime, usegmt=True)
+    base_headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+        **(headers or {}),
+    }
+    
+    if _etag_matches(request, etag) or _not_modified_since(request, st.st_mtime):
+        return Response(status_code=304, headers=base_headers)
+    
+    range_header = request.headers.get("range")
+    if not range_header:
+        for encoding in _accepted_encodings(request.headers.get("accept-encoding", "")):
+            sibling = _precompressed_sibling(path, st, encoding)
+            if sibling is not None:
+                return FileResponse(
+                    path=sibling[0],
+                    media_type=media_type,
+                    filename=filename,
+                    stat_result=sibling[1],
+                    headers={
+                        **base_headers,
+                        "ETag": _encoded_etag(etag, encoding),
+                        "Content-Encoding": encoding,
+                        "Vary": ", ".join(filter(None, [base_headers.get("Vary"), "Accept-Encoding"])),
+                    },
+                )
+    
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range in (etag, last_modified)):
+        ranges = _parse_range(range_header, st.st_size)
+        if ranges == []:
+            return Response(status_code=416, headers={**base_headers, "Content-Range": f"bytes */{st.st_size}"})
+        if ranges and len(ranges) == 1:
+            start, end = ranges[0]
+            return StreamingResponse(
+                _iter_file_range(path, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers={
+                    **base_headers,
+                    "Content-Range": f"bytes {start}-{end}/{st.st_size}",
+                    "Content-Length": str(end - start + 1),
+                },
+            )
+        if ranges:
+            boundary = uuid.uuid4().hex
+            parts = [
+                (
+                    f"\r\n--{boundary}\r\nContent-Type: {media_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{st.st_size}\r\n\r\n".encode(),
+                    (start, end),
+                )
+                for start, end in ranges
+            ]
+            length = sum(len(h) + end - start + 1 for h, (start, end) in parts) + len(f"\r\n--{boundary}--\r\n")
+            return StreamingResponse(
+                _iter_multipart_ranges(path, parts, boundary),
+                status_code=206,
+                media_type=f"multipart/byteranges; boundary={boundary}",
+                headers={**base_headers, "Content-Length": str(length)},
+            )
+    
+    return FileResponse(path=path, media_type=media_type, filename=filename, stat_result=st, headers=base_headers)
+
+
 # Existing routes
 @api_router.get("/")
 async def root():
     return {"message": "ORBYA Portfolio API - System Online"}
 
+# Write-behind buffering for status checks and contact messages
+WRITE_BEHIND = os.environ.get('WRITE_BEHIND', 'false').lower() == 'true'
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', '100'))
+WRITE_BEHIND_INTERVAL = float(os.environ.get('WRITE_BEHIND_INTERVAL', '0.5'))
+WRITE_BEHIND_SPILL = DATA_DIR / "write_behind.log"
+
+
+def _append_spill(path: Path, lines: List[str]) -> None:
+    with _file_lock(path), open(path, "a", encoding="utf-8") as f:
+        f.writelines(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _take_spill(path: Path) -> List[str]:
+    """Read and remove the spill log; lines that fail to replay are spilled again"""
+    with _file_lock(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        os.remove(path)
+    return lines
+
+
+class WriteBehind:
+    """Buffer inserts per collection and write them with insert_many.
+
+    Documents are acknowledged as soon as they are queued. A batch is
+    written when a collection reaches ``batch_size`` documents or every
+    ``interval`` seconds, and whatever is left is flushed on shutdown. If
+    Mongo rejects a batch for anything other than per-document errors, the
+    batch is appended to ``spill_path`` (one Extended JSON line per
+    document) and replayed on the next successful flush or at startup.
+
+    When disabled, ``insert`` writes straight through to storage.
+    """
+
+    def __init__(self, enabled: bool, batch_size: int, interval: float, spill_path: Path):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.interval = interval
+        self.spill_path = spill_path
+        self._buffers = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._stopping = False
+        self._spilled = spill_path.exists()
+        self.flushed = 0
+        self.spilled = 0
+
+    async def insert(self, collection: str, doc: dict) -> None:
+        if not self.enabled:
+            await storage.inbox(collection).add(doc)
+            return
+        buffer = self._buffers.setdefault(collection, [])
+        buffer.append(doc)
+        if len(buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Let a flush in progress finish: cancelling it would lose the batch it swapped out
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Write-behind flush failed: %s", e)
+
+    async def flush(self) -> None:
+        # Swap the buffers out before the first await so new inserts start a fresh batch
+        buffers, self._buffers = self._buffers, {}
+        results = [await self._write(collection, docs) for collection, docs in buffers.items() if docs]
+        # Replay the spill log once Mongo is taking writes again
+        if self._spilled and results and all(results):
+            await self.replay()
+
+    async def _write(self, collection: str, docs: List[dict]) -> bool:
+        try:
+            # Per-document failures (e.g. duplicate ids after a replay) are not retried
+            rejected = await storage.inbox(collection).add_many(docs)
+        except StorageUnavailable as e:
+            logger.error("Write-behind spilling %d document(s) for %s: %s", len(docs), collection, e)
+            lines = [json_util.dumps({"collection": collection, "document": doc}) + "\n" for doc in docs]
+            await run_io(_append_spill, self.spill_path, lines)
+            self._spilled = True
+            self.spilled += len(docs)
+            return False
+        if rejected:
+            logger.warning("Write-behind dropped %d document(s) for %s", rejected, collection)
+        self.flushed += len(docs) - rejected
+        return True
+
+    async def replay(self) -> None:
+        """Re-insert spilled documents; the log is rewritten with any that fail again"""
+        self._spilled = False
+        batches = {}
+        for line in await run_io(_take_spill, self.spill_path):
+            try:
+                entry = json_util.loads(line)
+            except ValueError:
+                logger.warning("Skipping corrupt write-behind spill line")
+                continue
+            batches.setdefault(entry["collection"], []).append(entry["document"])
+        for collection, docs in batches.items():
+            if await self._write(collection, docs):
+                logger.info("Replayed %d spilled document(s) into %s", len(docs), collection)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": self.pending(),
+            "flushed": self.flushed,
+            "spilled": self.spilled,
+        }
+
+
+write_behind = WriteBehind(WRITE_BEHIND, WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_INTERVAL, WRITE_BEHIND_SPILL)
+metrics.register(CallbackMetric(
+    "write_behind_documents", "gauge", "Write-behind documents by state", ("state",),
+    lambda: (((state,), write_behind.stats()[state]) for state in ("pending", "flushed", "spilled")),
+))
+
+
+# Inbox pagination: status checks and contact messages are stored with
+# native BSON date timestamps and read newest first by (timestamp, id)
+INBOX_PAGE_SIZE = 50
+
+
+def _encode_inbox_cursor(doc: dict) -> str:
+    raw = json.dumps([doc["timestamp"].isoformat(), doc["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_inbox_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """``(timestamp, id)`` of the last entry the client has seen"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        stamp, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(stamp), str(last_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _inbox_page(inbox, response: Response, limit: int, cursor: Optional[str]) -> List[dict]:
+    # Fetch one extra document to know whether another page exists
+    docs = await inbox.page(_decode_inbox_cursor(cursor), limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = _encode_inbox_cursor(docs[-1])
+    return docs
+
+
+def _inbox_export(inbox, model, cursor: Optional[str], filename: str) -> StreamingResponse:
+    """Stream every document after ``cursor`` as NDJSON, one batch in memory at a time"""
+    after = _decode_inbox_cursor(cursor)
+    
+    async def lines():
+        async for doc in inbox.scan(after):
+            yield model.model_validate(doc).model_dump_json() + "\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
     
     doc = status_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     
-    _ = await db.status_checks.insert_one(doc)
+    await write_behind.insert("status_checks", doc)
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    
-    for check in status_checks:
-        if isinstance(check['timestamp'], str):
-            check['timestamp'] = datetime.fromisoformat(check['timestamp'])
-    
-    return status_checks
+async def get_status_checks(
+    response: Response,
+    limit: int = Query(INBOX_PAGE_SIZE, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    output: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+):
+    """Status checks, newest first; the next page's cursor is in ``X-Next-Cursor``"""
+    if output == "ndjson":
+        return _inbox_export(storage.status_checks, StatusCheck, cursor, "status_checks.ndjson")
+    return await _inbox_page(storage.status_checks, response, limit, cursor)
 
 
 # Contact form endpoint
@@ -150,28 +1220,33 @@ async def submit_contact(input: ContactMessageCreate):
     contact_obj = ContactMessage(**contact_dict)
     
     doc = contact_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     
-    _ = await db.contact_messages.insert_one(doc)
+    await write_behind.insert("contact_messages", doc)
     
     return contact_obj
 
 
-# Get all contact messages
+# Get contact messages
 @api_router.get("/contact", response_model=List[ContactMessage])
-async def get_contact_messages():
-    messages = await db.contact_messages.find({}, {"_id": 0}).to_list(1000)
-    
-    for msg in messages:
-        if isinstance(msg['timestamp'], str):
-            msg['timestamp'] = datetime.fromisoformat(msg['timestamp'])
-    
-    return messages
+async def get_contact_messages(
+    response: Response,
+    limit: int = Query(INBOX_PAGE_SIZE, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    output: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+):
+    """Contact messages, newest first.
+
+    ``format=ndjson`` streams the whole inbox (from ``cursor`` on) as an
+    export instead of returning a single page.
+    """
+    if output == "ndjson":
+        return _inbox_export(storage.contact_messages, ContactMessage, cursor, "contact_messages.ndjson")
+    return await _inbox_page(storage.contact_messages, response, limit, cursor)
 
 
 # Resume download endpoint
 @api_router.get("/resume/download")
-async def download_resume():
+async def download_resume(request: Request):
     resume_path = ROOT_DIR / "static" / "ORBYA_Resume.pdf"
     
     if not resume_path.exists():
@@ -180,42 +1255,520 @@ async def download_resume():
             detail="Resume file not found. Please upload a PDF file to /app/backend/static/ORBYA_Resume.pdf"
         )
     
-    return FileResponse(
-        path=resume_path,
+    return _file_response(
+        request,
+        resume_path,
         media_type="application/pdf",
         filename="ORBYA_Resume.pdf"
     )
 
 
+# Id sequences for projects and skills, kept by the storage backend
+_seeded_sequences = set()
+
+
+async def next_id(name: str, document: str) -> int:
+    """Atomically allocate the next integer id for collection ``name``.
+
+    The counter is seeded once per process from the highest id in the
+    collection, or in ``document`` when the collection is empty. Raising
+    a sequence never lowers it, so concurrent first calls are harmless.
+    """
+    if name not in _seeded_sequences:
+        latest = await storage.records(name).max_id()
+        current = latest if latest is not None else max(await _record_index(document), default=0)
+        await storage.raise_sequence(name, current)
+        _seeded_sequences.add(name)
+    
+    return await storage.next_sequence(name)
+
+
+# JSON -> storage sync
+def _record_hash(record: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(record, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+
+
+async def sync_collection(name: str, records: List[dict]) -> dict:
+    """Make collection ``name`` match ``records`` with one batched write.
+
+    Records are compared by content hash against what is stored, so only
+    new or changed ids are upserted and only ids missing from ``records``
+    are deleted. The collection is never emptied in between.
+    """
+    started = time.perf_counter()
+    repository = storage.records(name)
+    stored = {doc["id"]: _record_hash(doc) for doc in await repository.all()}
+    read_done = time.perf_counter()
+    
+    changed = [record for record in records if stored.get(record["id"]) != _record_hash(record)]
+    stale_ids = list(stored.keys() - {record["id"] for record in records})
+    diff_done = time.perf_counter()
+    
+    upserted, modified, deleted = await repository.apply(changed, stale_ids)
+    if records:
+        await storage.raise_sequence(name, max(record["id"] for record in records))
+    write_done = time.perf_counter()
+    
+    return {
+        "total": len(records),
+        "inserted": upserted,
+        "updated": modified,
+        "deleted": deleted,
+        "unchanged": len(records) - upserted - modified,
+        "timings_ms": {
+            "read": round((read_done - started) * 1000, 2),
+            "diff": round((diff_done - read_done) * 1000, 2),
+            "write": round((write_done - diff_done) * 1000, 2),
+        },
+    }
+
+
+# Read-through snapshots of projects and skills
+SNAPSHOT_CHANGE_STREAM = os.environ.get('SNAPSHOT_CHANGE_STREAM', 'false').lower() == 'true'
+SNAPSHOT_RETRY_SECONDS = 5.0
+
+
+class Snapshot(NamedTuple):
+    records: tuple
+    by_id: dict
+    # None while the collection is empty, so readers fall back to the JSON file
+    body: Optional[JsonBody]
+    version: int
+
+
+class RecordSnapshot:
+    """Immutable in-process copy of one record collection, read through from storage.
+
+    The first read loads the collection; later reads return the same
+    ``Snapshot`` without touching storage. Writes build a new snapshot from
+    the current one (copy on write) and swap the reference, so a reader
+    never sees a half-applied change. Every write or ``invalidate`` bumps
+    the version, and a load that overlapped one is returned but not kept.
+    Records are shared, so callers must copy before mutating.
+    """
+
+    def __init__(self, name: str, adapter: TypeAdapter):
+        self.name = name
+        self.adapter = adapter
+        self.version = 0
+        self._current = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, records) -> Snapshot:
+        records = tuple(records)
+        body = _make_body(list(records), self.adapter) if records else None
+        return Snapshot(records, _index_by_id(records), body, self.version)
+
+    async def get(self) -> Snapshot:
+        current = self._current
+        if current is not None:
+            self.hits += 1
+            return current
+        async with self._lock:
+            if self._current is not None:
+                self.hits += 1
+                return self._current
+            self.misses += 1
+            version = self.version
+            snapshot = self._build(await storage.records(self.name).all())
+            if version == self.version:
+                self._current = snapshot
+            return snapshot
+
+    def _swap(self, records) -> None:
+        self.version += 1
+        if self._current is not None:
+            self._current = self._build(records)
+
+    def upsert(self, record: dict) -> None:
+        """Replace the record with ``record``'s id, or append it"""
+        records = list(self._current.records) if self._current is not None else []
+        for index, existing in enumerate(records):
+            if existing["id"] == record["id"]:
+                records[index] = record
+                break
+        else:
+            records.append(record)
+        self._swap(records)
+
+    def remove(self, record_id: int) -> None:
+        records = self._current.records if self._current is not None else ()
+        self._swap([record for record in records if record["id"] != record_id])
+
+    def replace_all(self, records: List[dict]) -> None:
+        self._swap(records)
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._current = None
+
+    def stats(self) -> dict:
+        current = self._current
+        return {
+            "loaded": current is not None,
+            "version": self.version,
+            "records": len(current.records) if current is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+snapshots = {
+    "projects": RecordSnapshot("projects", ProjectList),
+    "skills": RecordSnapshot("skills", SkillList),
+}
+for _name, _snapshot in snapshots.items():
+    track_cache(f"{_name}_snapshot", _snapshot)
+snapshot_watcher = None
+
+
+async def watch_snapshots() -> None:
+    """Drop snapshots when another worker changes a collection (Mongo change streams).
+
+    Our own writes come back through the stream too and cost one reload.
+    After the stream fails everything is dropped, since changes may have
+    been missed, and the stream is reopened.
+    """
+    while True:
+        try:
+            async for name in storage.watch(list(snapshots)):
+                snapshots[name].invalidate()
+                search_index.invalidate()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Snapshot change stream failed: %s; retrying in %.0fs", e, SNAPSHOT_RETRY_SECONDS)
+        for snapshot in snapshots.values():
+            snapshot.invalidate()
+        search_index.invalidate()
+        await asyncio.sleep(SNAPSHOT_RETRY_SECONDS)
+
+
+# Change feed: versioned change events from the write paths, pushed over SSE
+CHANGE_TYPES = ("project", "skill", "media", "config", "stats", "quotes")
+CHANGE_FEED_BACKLOG = 512
+CHANGE_FEED_HEARTBEAT = 15.0
+
+
+class ChangeFeed:
+    """Fan out change events to any number of SSE subscribers.
+
+    Each event is encoded once into an SSE frame and kept in a bounded
+    backlog, so reconnecting clients resume from ``Last-Event-ID``. Idle
+    subscribers share one ``asyncio.Event`` that is swapped on every
+    publish: waking them costs a single ``set()``, and nothing is queued
+    per subscriber. Event ids are ``<epoch>:<version>``; a client whose id
+    comes from another process lifetime, or has fallen out of the backlog,
+    gets a ``reset`` event and should refetch.
+    """
+
+    def __init__(self, backlog: int = CHANGE_FEED_BACKLOG):
+        self.epoch = format(time.time_ns(), "x")
+        self.version = 0
+        self.subscribers = 0
+        self._events = deque(maxlen=backlog)
+        self._published = asyncio.Event()
+
+    def _frame(self, event: str, version: int, payload: dict) -> bytes:
+        data = json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {self.epoch}:{version}\nevent: {event}\ndata: {data}\n\n".encode("utf-8")
+
+    def publish(self, kind: str, op: str, record_id=None, data=None, broadcast: bool = True) -> int:
+        """Record a change; ``op`` is upsert, delete, or reset (refetch the whole type).
+
+        With ``broadcast`` the other worker processes are told too, so they
+        drop their caches for ``kind``.
+        """
+        self.version += 1
+        payload = {"version": self.version, "type": kind, "op": op, "id": record_id, "data": data}
+        self._events.append((self.version, kind, self._frame("change", self.version, payload)))
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+        if broadcast:
+            worker_generations.bump(kind)
+        return self.version
+
+    def resume_point(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Version to continue after, or None when the client must start with a reset"""
+        if not last_event_id:
+            return self.version
+        epoch, _, version = last_event_id.partition(":")
+        if epoch != self.epoch or not version.isdigit() or int(version) > self.version:
+            return None
+        return int(version)
+
+    def _since(self, version: int) -> Optional[list]:
+        if version >= self.version:
+            return []
+        if not self._events or self._events[0][0] > version + 1:
+            return None
+        return list(itertools.islice(self._events, version + 1 - self._events[0][0], None))
+
+    async def stream(self, version: Optional[int], kinds: Optional[set]):
+        self.subscribers += 1
+        try:
+            if version is None:
+                version = self.version
+                yield self._frame("reset", version, {"version": version})
+            else:
+                yield self._frame("ready", version, {"version": version})
+            while True:
+                events = self._since(version)
+                if events is None:
+                    # Fell behind the backlog while writing to a slow client
+                    version = self.version
+                    yield self._frame("reset", version, {"version": version})
+                    continue
+                for event_version, kind, frame in events:
+                    if kinds is None or kind in kinds:
+                        yield frame
+                    version = event_version
+                if events:
+                    continue
+                published = self._published
+                try:
+                    await asyncio.wait_for(published.wait(), CHANGE_FEED_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.subscribers -= 1
+
+
+change_feed = ChangeFeed()
+metrics.register(CallbackMetric(
+    "change_feed_subscribers", "gauge", "Open change feed connections", (),
+    lambda: [((), change_feed.subscribers)],
+))
+
+
+@api_router.get("/changes")
+async def stream_changes(
+    request: Request,
+    types: Optional[str] = Query(None, description="Comma-separated change types to receive"),
+    since: Optional[str] = Query(None, description="Event id to resume after, when Last-Event-ID cannot be sent"),
+):
+    """Server-sent events for project/skill/media/config/stats/quotes changes.
+
+    Each ``change`` event carries ``{version, type, op, id, data}`` where
+    ``data`` is the new record for upserts. A ``reset`` event means the
+    client missed changes and should refetch what it shows.
+    """
+    kinds = None
+    if types:
+        kinds = {t.strip() for t in types.split(",") if t.strip()}
+        unknown = kinds - set(CHANGE_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown change types: {', '.join(sorted(unknown))}")
+    
+    version = change_feed.resume_point(request.headers.get("last-event-id") or since)
+    return StreamingResponse(
+        change_feed.stream(version, kinds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Cross-process cache invalidation for multi-worker deployments (see gunicorn.conf.py)
+MULTI_WORKER = os.environ.get('MULTI_WORKER', 'false').lower() == 'true'
+WORKER_SYNC_PATH = Path(os.environ.get('WORKER_SYNC_PATH', DATA_DIR / "worker_generations"))
+WORKER_SYNC_INTERVAL = float(os.environ.get('WORKER_SYNC_INTERVAL', '0.1'))
+GENERATION = struct.Struct("<Q")
+
+
+class WorkerGenerations:
+    """One change counter per topic in a memory-mapped file shared by every worker.
+
+    A worker that writes bumps the topic's counter under the file's lock.
+    Each worker polls the counters every ``interval`` seconds (a read of
+    shared memory, no syscalls) and calls ``on_change(topic)`` for every
+    counter that another worker moved. Every method is a no-op unless
+    ``enabled``.
+    """
+
+    def __init__(self, enabled: bool, path: Path, topics, interval: float, on_change):
+        self.enabled = enabled
+        self.path = path
+        self.topics = list(topics)
+        self.interval = interval
+        self.on_change = on_change
+        self._map = None
+        self._seen = [0] * len(self.topics)
+        self._task = None
+
+    def _counter(self, index: int) -> int:
+        return GENERATION.unpack_from(self._map, index * GENERATION.size)[0]
+
+    def open(self) -> None:
+        if not self.enabled or self._map is not None:
+            return
+        size = GENERATION.size * len(self.topics)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path):
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._map = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        self._seen = [self._counter(index) for index in range(len(self.topics))]
+
+    def bump(self, topic: str) -> None:
+        if self._map is None:
+            return
+        index = self.topics.index(topic)
+        with _file_lock(self.path):
+            value = self._counter(index)
+            GENERATION.pack_into(self._map, index * GENERATION.size, value + 1)
+        # Another worker moved it since our last poll; that change is still ours to apply
+        missed = value != self._seen[index]
+        self._seen[index] = value + 1
+        if missed:
+            self.on_change(topic)
+
+    def poll(self) -> None:
+        if self._map is None:
+            return
+        for index, topic in enumerate(self.topics):
+            value = self._counter(index)
+            if value != self._seen[index]:
+                self._seen[index] = value
+                self.on_change(topic)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Worker generation poll failed")
+
+    def start(self) -> None:
+        self.open()
+        if self._map is not None and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def _drop_local_caches(kind: str) -> None:
+    """Another worker wrote ``kind``: forget what this one cached and tell its subscribers"""
+    if kind in ("project", "skill"):
+        snapshots[f"{kind}s"].invalidate()
+        search_index.invalidate()
+    elif kind == "media":
+        media_catalog.invalidate()
+    elif kind == "quotes":
+        daily_quotes.invalidate()
+    # config and stats are read through the document cache, which revalidates by stat
+    change_feed.publish(kind, "reset", broadcast=False)
+
+
+worker_generations = WorkerGenerations(MULTI_WORKER, WORKER_SYNC_PATH, CHANGE_TYPES, WORKER_SYNC_INTERVAL, _drop_local_caches)
+
+
 # Projects endpoints
-@api_router.get("/projects", response_model=List[Project])
-async def get_projects():
-    """Get all projects from MongoDB or JSON file"""
-    # Try MongoDB first
-    projects = await db.projects.find({}, {"_id": 0}).to_list(1000)
+PROJECT_FIELDS = set(Project.model_fields)
+
+
+def _encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_fields(fields: Optional[str], allowed: set) -> Optional[List[str]]:
+    """Split a ``fields=`` parameter, always keeping ``id`` so results stay addressable"""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in requested if f != "id"]
+
+
+async def _projects_body() -> JsonBody:
+    # Try storage first
+    snapshot = await snapshots["projects"].get()
     
-    if not projects:
-        # Fallback to JSON file
-        projects_file = ROOT_DIR / "data" / "projects.json"
-        if projects_file.exists():
-            with open(projects_file, 'r') as f:
-                projects = json.load(f)
+    if snapshot.body is not None:
+        return snapshot.body
     
-    return projects
+    # Fallback to JSON file
+    return await _document_body("projects.json", [], ProjectList)
+
+
+@api_router.get("/projects", response_model=List[Project])
+async def get_projects(
+    request: Request,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    year: Optional[int] = None,
+    tags: Optional[str] = Query(None, description="Comma-separated; matches projects with any of the tags"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """Get projects from storage or JSON file, optionally filtered, projected and paginated.
+
+    Queries run against the in-process snapshot. Paginated responses are
+    ordered by id and carry the cursor for the next page in the
+    ``X-Next-Cursor`` header.
+    """
+    tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else None
+    field_list = _parse_fields(fields, PROJECT_FIELDS)
+    after_id = _decode_cursor(cursor) if cursor else None
+    
+    if not any(v is not None for v in (category, featured, year, tag_list, field_list, limit, after_id)):
+        return _json_response(request, await _projects_body())
+    
+    where = RecordFilter(category, featured, year, tag_list)
+    # Empty collection: apply the same query to the JSON file
+    records = (await snapshots["projects"].get()).records or await documents.load("projects.json", [])
+    projects = [p for p in records if where.matches(p) and (after_id is None or p["id"] > after_id)]
+    if limit is not None or after_id is not None:
+        projects.sort(key=lambda p: p["id"])
+    if limit is not None:
+        # Keep one extra project to know whether another page exists
+        projects = projects[:limit + 1]
+    if field_list:
+        projects = [{f: p[f] for f in field_list if f in p} for p in projects]
+    
+    headers = {}
+    if limit is not None and len(projects) > limit:
+        projects = projects[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(projects[-1]["id"])
+    
+    body = _make_body(projects) if field_list else _make_body(projects, ProjectList)
+    return _json_response(request, body, headers)
 
 
 @api_router.get("/projects/{project_id}", response_model=Project)
 async def get_project(project_id: int):
     """Get a specific project by ID"""
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    project = (await snapshots["projects"].get()).by_id.get(project_id)
     
     if not project:
         # Try JSON file
-        projects_file = ROOT_DIR / "data" / "projects.json"
-        if projects_file.exists():
-            with open(projects_file, 'r') as f:
-                projects = json.load(f)
-                project = next((p for p in projects if p["id"] == project_id), None)
+        project = (await _record_index("projects.json")).get(project_id)
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -245,16 +1798,7 @@ def _auto_youtube_thumbnail(video_url: str) -> str:
 @api_router.post("/projects", response_model=Project)
 async def create_project(project: ProjectCreate):
     """Add a new project"""
-    existing_projects = await db.projects.find({}, {"_id": 0, "id": 1}).to_list(1000)
-    
-    if not existing_projects:
-        projects_file = ROOT_DIR / "data" / "projects.json"
-        if projects_file.exists():
-            with open(projects_file, 'r') as f:
-                existing_projects = json.load(f)
-    
-    max_id = max([p.get("id", 0) for p in existing_projects]) if existing_projects else 0
-    new_id = max_id + 1
+    new_id = await next_id("projects", "projects.json")
     
     project_dict = project.model_dump()
     # Auto-generate YouTube thumbnail if none provided
@@ -264,7 +1808,10 @@ async def create_project(project: ProjectCreate):
     project_obj = Project(id=new_id, **project_dict)
     
     doc = project_obj.model_dump()
-    await db.projects.insert_one(doc)
+    await storage.projects.insert(doc)
+    snapshots["projects"].upsert(doc)
+    search_index.add("project", project_obj.model_dump())
+    change_feed.publish("project", "upsert", new_id, project_obj.model_dump())
     
     return project_obj
 
@@ -272,7 +1819,7 @@ async def create_project(project: ProjectCreate):
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(project_id: int, project: ProjectCreate):
     """Update an existing project"""
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    existing = await storage.projects.get(project_id)
     
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -283,7 +1830,10 @@ async def update_project(project_id: int, project: ProjectCreate):
     if not update_data.get("thumbnail") and update_data.get("videoUrl"):
         update_data["thumbnail"] = _auto_youtube_thumbnail(update_data["videoUrl"])
     
-    await db.projects.replace_one({"id": project_id}, update_data)
+    await storage.projects.replace(project_id, update_data)
+    snapshots["projects"].upsert(update_data)
+    search_index.add("project", update_data)
+    change_feed.publish("project", "upsert", project_id, update_data)
     
     return Project(**update_data)
 
@@ -291,64 +1841,57 @@ async def update_project(project_id: int, project: ProjectCreate):
 @api_router.delete("/projects/{project_id}")
 async def delete_project(project_id: int):
     """Delete a project"""
-    result = await db.projects.delete_one({"id": project_id})
-    
-    if result.deleted_count == 0:
+    if not await storage.projects.delete(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
+    snapshots["projects"].remove(project_id)
+    search_index.remove("project", project_id)
+    change_feed.publish("project", "delete", project_id)
     
     return {"message": "Project deleted successfully", "id": project_id}
 
 
 @api_router.post("/projects/sync")
 async def sync_projects_to_db():
-    """Sync projects from JSON file to MongoDB"""
-    projects_file = ROOT_DIR / "data" / "projects.json"
+    """Sync projects from JSON file to storage"""
+    projects = await documents.load("projects.json")
     
-    if not projects_file.exists():
+    if projects is None:
         raise HTTPException(status_code=404, detail="Projects JSON file not found")
     
-    with open(projects_file, 'r') as f:
-        projects = json.load(f)
-    
-    # Clear existing projects
-    await db.projects.delete_many({})
+    result = await sync_collection("projects", projects)
+    snapshots["projects"].replace_all(projects)
+    search_index.rebuild("project", projects)
+    change_feed.publish("project", "reset")
     
-    # Insert all projects
-    if projects:
-        await db.projects.insert_many(projects)
-    
-    return {"message": f"Synced {len(projects)} projects to database"}
+    return {"message": f"Synced {len(projects)} projects to database", **result}
 
 
 # Skills endpoints
 @api_router.get("/skills", response_model=List[Skill])
-async def get_skills():
-    """Get all skills from MongoDB or JSON file"""
-    # Try MongoDB first
-    skills = await db.skills.find({}, {"_id": 0}).to_list(1000)
+async def get_skills(request: Request):
+    """Get all skills from storage or JSON file"""
+    return _json_response(request, await _skills_body())
+
+
+async def _skills_body() -> JsonBody:
+    # Try storage first
+    snapshot = await snapshots["skills"].get()
     
-    if not skills:
-        # Fallback to JSON file
-        skills_file = ROOT_DIR / "data" / "skills.json"
-        if skills_file.exists():
-            with open(skills_file, 'r') as f:
-                skills = json.load(f)
+    if snapshot.body is not None:
+        return snapshot.body
     
-    return skills
+    # Fallback to JSON file
+    return await _document_body("skills.json", [], SkillList)
 
 
 @api_router.get("/skills/{skill_id}", response_model=Skill)
 async def get_skill(skill_id: int):
     """Get a specific skill by ID"""
-    skill = await db.skills.find_one({"id": skill_id}, {"_id": 0})
+    skill = (await snapshots["skills"].get()).by_id.get(skill_id)
     
     if not skill:
         # Try JSON file
-        skills_file = ROOT_DIR / "data" / "skills.json"
-        if skills_file.exists():
-            with open(skills_file, 'r') as f:
-                skills = json.load(f)
-                skill = next((s for s in skills if s["id"] == skill_id), None)
+        skill = (await _record_index("skills.json")).get(skill_id)
     
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
@@ -359,24 +1902,16 @@ async def get_skill(skill_id: int):
 @api_router.post("/skills", response_model=Skill)
 async def create_skill(skill: SkillCreate):
     """Add a new skill"""
-    # Get the highest ID
-    existing_skills = await db.skills.find({}, {"_id": 0, "id": 1}).to_list(1000)
-    
-    if not existing_skills:
-        # Check JSON file
-        skills_file = ROOT_DIR / "data" / "skills.json"
-        if skills_file.exists():
-            with open(skills_file, 'r') as f:
-                existing_skills = json.load(f)
-    
-    max_id = max([s.get("id", 0) for s in existing_skills]) if existing_skills else 0
-    new_id = max_id + 1
+    new_id = await next_id("skills", "skills.json")
     
     skill_dict = skill.model_dump()
     skill_obj = Skill(id=new_id, **skill_dict)
     
     doc = skill_obj.model_dump()
-    await db.skills.insert_one(doc)
+    await storage.skills.insert(doc)
+    snapshots["skills"].upsert(doc)
+    search_index.add("skill", skill_obj.model_dump())
+    change_feed.publish("skill", "upsert", new_id, skill_obj.model_dump())
     
     return skill_obj
 
@@ -384,7 +1919,7 @@ async def create_skill(skill: SkillCreate):
 @api_router.put("/skills/{skill_id}", response_model=Skill)
 async def update_skill(skill_id: int, skill: SkillCreate):
     """Update an existing skill"""
-    existing = await db.skills.find_one({"id": skill_id}, {"_id": 0})
+    existing = await storage.skills.get(skill_id)
     
     if not existing:
         raise HTTPException(status_code=404, detail="Skill not found")
@@ -392,7 +1927,10 @@ async def update_skill(skill_id: int, skill: SkillCreate):
     update_data = skill.model_dump()
     update_data["id"] = skill_id
     
-    await db.skills.replace_one({"id": skill_id}, update_data)
+    await storage.skills.replace(skill_id, update_data)
+    snapshots["skills"].upsert(update_data)
+    search_index.add("skill", update_data)
+    change_feed.publish("skill", "upsert", skill_id, update_data)
     
     return Skill(**update_data)
 
@@ -400,137 +1938,344 @@ async def update_skill(skill_id: int, skill: SkillCreate):
 @api_router.delete("/skills/{skill_id}")
 async def delete_skill(skill_id: int):
     """Delete a skill"""
-    result = await db.skills.delete_one({"id": skill_id})
-    
-    if result.deleted_count == 0:
+    if not await storage.skills.delete(skill_id):
         raise HTTPException(status_code=404, detail="Skill not found")
+    snapshots["skills"].remove(skill_id)
+    search_index.remove("skill", skill_id)
+    change_feed.publish("skill", "delete", skill_id)
     
     return {"message": "Skill deleted successfully", "id": skill_id}
 
 
 @api_router.post("/skills/sync")
 async def sync_skills_to_db():
-    """Sync skills from JSON file to MongoDB"""
-    skills_file = ROOT_DIR / "data" / "skills.json"
+    """Sync skills from JSON file to storage"""
+    skills = await documents.load("skills.json")
     
-    if not skills_file.exists():
+    if skills is None:
         raise HTTPException(status_code=404, detail="Skills JSON file not found")
     
-    with open(skills_file, 'r') as f:
-        skills = json.load(f)
-    
-    # Clear existing skills
-    await db.skills.delete_many({})
-    
-    # Insert all skills
-    if skills:
-        await db.skills.insert_many(skills)
-    
-    return {"message": f"Synced {len(skills)} skills to database"}
+    result = await sync_collection("skills", skills)
+    snapshots["skills"].replace_all(skills)
+    search_index.rebuild("skill", skills)
+    change_feed.publish("skill", "reset")
+    
+    return {"message": f"Synced {len(skills)} skills to database", **result}
+
+
+# Search endpoint
+# Indexed text per record type: (field, weight); the weight scales term frequency
+SEARCH_FIELDS = {
+    "project": (("title", 2), ("description", 1), ("category", 1), ("tags", 1)),
+    "skill": (("name", 2), ("module", 1)),
+}
+SEARCH_TOKEN = _re.compile(r"[^\W_]+")
+# Terms a single query prefix may expand to, and the score factor for a prefix-only match
+MAX_PREFIX_EXPANSIONS = 50
+PREFIX_MATCH_WEIGHT = 0.8
+
+
+def _tokenize(text: str) -> List[str]:
+    return SEARCH_TOKEN.findall(text.lower())
+
+
+class SearchIndex:
+    """In-process inverted index over projects and skills, ranked with BM25.
+
+    Postings map each term to ``{(type, id): weighted term frequency}``;
+    a sorted term list makes prefix expansion a bisect. Records are kept
+    alongside so a query never has to go back to storage. The write handlers
+    call ``add``/``remove``, and the sync endpoints ``rebuild`` one type.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._postings = {}
+        self._terms = []
+        self._lengths = {}
+        self._doc_terms = {}
+        self._records = {}
+        self._total_length = 0
+        self._built = False
+        self._build_lock = asyncio.Lock()
+
+    def _remove_key(self, key) -> None:
+        if key not in self._records:
+            return
+        del self._records[key]
+        self._total_length -= self._lengths.pop(key)
+        for term in self._doc_terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def add(self, kind: str, record: dict) -> None:
+        """Index ``record``, replacing any previous version with the same id"""
+        key = (kind, record["id"])
+        self._remove_key(key)
+        frequencies = {}
+        length = 0
+        for field, weight in SEARCH_FIELDS[kind]:
+            value = record.get(field) or ""
+            text = " ".join(value) if isinstance(value, list) else str(value)
+            for token in _tokenize(text):
+                frequencies[token] = frequencies.get(token, 0) + weight
+                length += weight
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[key] = frequency
+        self._records[key] = record
+        self._doc_terms[key] = list(frequencies)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def remove(self, kind: str, record_id: int) -> None:
+        self._remove_key((kind, record_id))
+
+    def rebuild(self, kind: str, records: List[dict]) -> None:
+        for key in [key for key in self._records if key[0] == kind]:
+            self._remove_key(key)
+        for record in records:
+            self.add(kind, record)
+
+    async def ensure_built(self) -> None:
+        """Build from the snapshots (or the JSON files when a collection is empty) on first use"""
+        if self._built:
+            return
+        async with self._build_lock:
+            if self._built:
+                return
+            for kind, name in (("project", "projects"), ("skill", "skills")):
+                records = (await snapshots[name].get()).records
+                self.rebuild(kind, records or await documents.load(f"{name}.json", []))
+            self._built = True
+
+    def invalidate(self) -> None:
+        """Rebuild from the snapshots on the next search"""
+        self._built = False
+
+    def _expand(self, token: str) -> List[tuple]:
+        """(term, factor) pairs for a query token: the exact term plus terms it prefixes"""
+        start = bisect.bisect_left(self._terms, token)
+        matches = []
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, 1.0 if term == token else PREFIX_MATCH_WEIGHT))
+        return matches
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 20) -> List[dict]:
+        count = len(self._records)
+        if not count:
+            return []
+        average_length = self._total_length / count or 1.0
+        scores = {}
+        for token in dict.fromkeys(_tokenize(query)):
+            # Score each document once per query token, by its best-matching expansion
+            best = {}
+            for term, factor in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    if kind is not None and key[0] != kind:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[key] / average_length)
+                    score = factor * idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    if score > best.get(key, 0.0):
+                        best[key] = score
+            for key, score in best.items():
+                scores[key] = scores.get(key, 0.0) + score
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0][1]))
+        return [
+            {"type": key[0], "id": key[1], "score": round(score, 4), "item": self._records[key]}
+            for key, score in ranked
+        ]
+
+
+search_index = SearchIndex()
+
+
+@api_router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[str] = Query(None, alias="type", pattern="^(project|skill)$"),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Full-text search over projects and skills.
+
+    Each word also matches the terms it is a prefix of ("cine" finds
+    "cinematic"), ranked just below exact matches.
+    """
+    await search_index.ensure_built()
+    results = search_index.search(q, kind, limit)
+    return {"query": q, "total": len(results), "results": results}
 
 
 # Quote of the day endpoint
+DEFAULT_QUOTE = {"quote": "Every frame tells a story.", "author": "Anonymous"}
+
+
+class DailyQuotes:
+    """Serialized quote-of-the-day bodies, resolved once per date.
+
+    The quote list is read once and each date's pick is kept until
+    ``invalidate`` is called from ``update_quotes``, so repeat lookups never
+    touch the filesystem. A lookup that overlapped an ``invalidate`` is
+    answered but not cached.
+    """
+
+    max_dates = 64
+
+    def __init__(self):
+        self._quotes = None
+        self._bodies = {}
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._quotes = None
+        self._bodies = {}
+
+    async def body(self, day: date) -> JsonBody:
+        cached = self._bodies.get(day)
+        if cached is not None:
+            return cached
+        
+        generation = self._generation
+        quotes = self._quotes
+        if quotes is None:
+            quotes = await documents.load("quotes.json", [])
+        
+        if quotes:
+            # Use date-based random for consistent quote per day; a private
+            # Random picks the same quote as seeding the global one did
+            seed = day.year * 10000 + day.month * 100 + day.day
+            quote = random.Random(seed).choice(quotes)
+        else:
+            quote = DEFAULT_QUOTE
+        
+        body = _make_body(quote)
+        if generation == self._generation:
+            self._quotes = quotes
+            if len(self._bodies) >= self.max_dates:
+                self._bodies = {}
+            self._bodies[day] = body
+        return body
+
+
+daily_quotes = DailyQuotes()
+
+
+def _local_now(tz: Optional[str] = None) -> datetime:
+    """Current time in ``tz`` (an IANA name), or server-local time."""
+    if tz is None:
+        return datetime.now().astimezone()
+    try:
+        return datetime.now(ZoneInfo(tz))
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {tz}")
+
+
 @api_router.get("/quote")
-async def get_quote_of_the_day():
+async def get_quote_of_the_day(
+    request: Request,
+    day: Optional[date] = Query(None, alias="date", description="YYYY-MM-DD; defaults to today"),
+    tz: Optional[str] = Query(None, description="IANA timezone used to decide what today is"),
+):
     """Get a random quote from filmmaking/video editing"""
-    quotes_file = ROOT_DIR / "data" / "quotes.json"
-    
-    if not quotes_file.exists():
-        return {"quote": "Every frame tells a story.", "author": "Anonymous"}
-    
-    with open(quotes_file, 'r') as f:
-        quotes = json.load(f)
+    if day is not None:
+        return _json_response(request, await daily_quotes.body(day))
     
-    if not quotes:
-        return {"quote": "Every frame tells a story.", "author": "Anonymous"}
-    
-    # Use date-based random for consistent quote per day
-    import random
-    from datetime import date
-    today = date.today()
-    seed = today.year * 10000 + today.month * 100 + today.day
-    random.seed(seed)
-    
-    return random.choice(quotes)
+    now = _local_now(tz)
+    today = now.date()
+    midnight = datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+    # Browsers may keep today's quote until the local midnight
+    max_age = max(int((midnight - now).total_seconds()), 0)
+    response = _json_response(request, await daily_quotes.body(today))
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
 
 
 # Stats endpoint for dynamic stats
+# Default stats
+DEFAULT_STATS = [
+    {"label": "Projects", "value": "150+", "unit": "COMPLETED"},
+    {"label": "Experience", "value": "5+", "unit": "YEARS"},
+    {"label": "Clients", "value": "80+", "unit": "SATISFIED"},
+    {"label": "Hours", "value": "10K+", "unit": "EDITED"}
+]
+
+
 @api_router.get("/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get portfolio statistics from JSON file or return defaults"""
-    stats_file = ROOT_DIR / "data" / "stats.json"
-    
-    if stats_file.exists():
-        with open(stats_file, 'r') as f:
-            return json.load(f)
-    
-    # Default stats
-    return [
-        {"label": "Projects", "value": "150+", "unit": "COMPLETED"},
-        {"label": "Experience", "value": "5+", "unit": "YEARS"},
-        {"label": "Clients", "value": "80+", "unit": "SATISFIED"},
-        {"label": "Hours", "value": "10K+", "unit": "EDITED"}
-    ]
+    return _json_response(request, await _stats_body())
+
+
+async def _stats_body() -> JsonBody:
+    return await _document_body("stats.json", DEFAULT_STATS)
 
 
 @api_router.put("/stats")
 async def update_stats(stats: List[dict]):
     """Update portfolio statistics"""
-    stats_file = ROOT_DIR / "data" / "stats.json"
-    
-    with open(stats_file, 'w') as f:
-        json.dump(stats, f, indent=2)
+    await documents.write("stats.json", stats)
+    change_feed.publish("stats", "upsert", data=stats)
     
     return {"message": "Stats updated successfully", "stats": stats}
 
 
 # Site Configuration endpoints
+# Default config
+DEFAULT_CONFIG = {
+    "siteName": "ORBYA",
+    "ownerName": "SHRUNIT SHIRKE",
+    "tagline": "CINEMATIC VIDEO EDITOR • MOTION DESIGNER • VISUAL STORYTELLER",
+    "colors": {
+        "primary": "#FF4D00",
+        "background": "#000000",
+        "text": "#FFFFFF"
+    }
+}
+
+
+def _public_config(config: dict) -> dict:
+    # Don't expose password in public endpoint
+    return {k: v for k, v in config.items() if k != 'adminPassword'}
+
+
 @api_router.get("/config")
-async def get_config():
+async def get_config(request: Request):
     """Get site configuration"""
-    config_file = ROOT_DIR / "data" / "config.json"
-    
-    if config_file.exists():
-        with open(config_file, 'r') as f:
-            config = json.load(f)
-            # Don't expose password in public endpoint
-            public_config = {k: v for k, v in config.items() if k != 'adminPassword'}
-            return public_config
-    
-    # Default config
-    return {
-        "siteName": "ORBYA",
-        "ownerName": "SHRUNIT SHIRKE",
-        "tagline": "CINEMATIC VIDEO EDITOR • MOTION DESIGNER • VISUAL STORYTELLER",
-        "colors": {
-            "primary": "#FF4D00",
-            "background": "#000000",
-            "text": "#FFFFFF"
-        }
-    }
+    return _json_response(request, await _config_body())
+
+
+async def _config_body() -> JsonBody:
+    return await _document_body("config.json", DEFAULT_CONFIG, transform=_public_config)
 
 
 @api_router.put("/config")
 async def update_config(config: dict):
     """Update site configuration"""
-    config_file = ROOT_DIR / "data" / "config.json"
-    
-    # Load existing config to preserve password
-    existing_config = {}
-    if config_file.exists():
-        with open(config_file, 'r') as f:
-            existing_config = json.load(f)
-    
-    # Merge with existing config (preserve password if not provided)
-    if 'adminPassword' not in config and 'adminPassword' in existing_config:
-        config['adminPassword'] = existing_config['adminPassword']
+    def merge(existing_config: dict) -> dict:
+        # Merge with existing config (preserve password if not provided)
+        if 'adminPassword' not in config and 'adminPassword' in existing_config:
+            config['adminPassword'] = existing_config['adminPassword']
+        return config
     
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
+    # Load existing config under the file lock to preserve password
+    await documents.update("config.json", merge, {})
+    change_feed.publish("config", "upsert", data=_public_config(config))
     
     # Return without password
-    public_config = {k: v for k, v in config.items() if k != 'adminPassword'}
-    return {"message": "Config updated successfully", "config": public_config}
+    return {"message": "Config updated successfully", "config": _public_config(config)}
 
 
 # Admin authentication
@@ -540,13 +2285,10 @@ class AdminAuth(BaseModel):
 @api_router.post("/admin/auth")
 async def admin_authenticate(auth: AdminAuth):
     """Authenticate admin user"""
-    config_file = ROOT_DIR / "data" / "config.json"
+    config = await documents.load("config.json")
     
-    if config_file.exists():
-        with open(config_file, 'r') as f:
-            config = json.load(f)
-            if auth.password == config.get('adminPassword', 'admin'):
-                return {"success": True, "message": "Authentication successful"}
+    if config is not None and auth.password == config.get('adminPassword', 'admin'):
+        return {"success": True, "message": "Authentication successful"}
     
     raise HTTPException(status_code=401, detail="Invalid password")
 
@@ -554,21 +2296,17 @@ async def admin_authenticate(auth: AdminAuth):
 @api_router.put("/admin/password")
 async def change_admin_password(data: dict):
     """Change admin password"""
-    config_file = ROOT_DIR / "data" / "config.json"
-    
-    if not config_file.exists():
-        raise HTTPException(status_code=404, detail="Config file not found")
-    
-    with open(config_file, 'r') as f:
-        config = json.load(f)
-    
-    if data.get('currentPassword') != config.get('adminPassword'):
-        raise HTTPException(status_code=401, detail="Current password is incorrect")
-    
-    config['adminPassword'] = data.get('newPassword')
-    
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
+    def change(config: Optional[dict]) -> dict:
+        if config is None:
+            raise HTTPException(status_code=404, detail="Config file not found")
+        
+        if data.get('currentPassword') != config.get('adminPassword'):
+            raise HTTPException(status_code=401, detail="Current password is incorrect")
+        
+        # Copy before modifying so the cached document stays untouched
+        return {**config, 'adminPassword': data.get('newPassword')}
+    
+    await documents.update("config.json", change)
     
     return {"success": True, "message": "Password changed successfully"}
 
@@ -577,11 +2315,505 @@ async def change_admin_password(data: dict):
 ALLOWED_IMAGE_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
 ALLOWED_VIDEO_TYPES = {'video/mp4', 'video/webm', 'video/quicktime', 'video/x-msvideo'}
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Store uploads under their content hash so identical files share one copy
+CONTENT_ADDRESSED_UPLOADS = os.environ.get('CONTENT_ADDRESSED_UPLOADS', 'true').lower() == 'true'
+CANONICAL_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'video/mp4': 'mp4',
+    'video/webm': 'webm',
+    'video/quicktime': 'mov',
+    'video/x-msvideo': 'avi',
+}
+# Resized copies of uploaded images, named "<stem>-<width>w.<ext>", plus a
+# full-size "<stem>-full.webp" re-encode
+VARIANTS_DIR = UPLOADS_DIR / "variants"
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+VARIANT_SOURCE_TYPES = {'image/jpeg', 'image/png', 'image/webp'}  # Animated GIFs are left alone
+media_workers = ThreadPoolExecutor(max_workers=2, thread_name_prefix="media-workers")
+
+# "images/<filename>" -> number of uploads sharing the file; files without
+# an entry (uploaded before this was tracked) count as one reference
+MEDIA_REFS_DOCUMENT = "media_refs.json"
+MULTIPART_OVERHEAD = 64 * 1024  # Boundaries and part headers around the file
+
+
+class UploadLimitMiddleware:
+    """Reject request bodies to ``path`` larger than ``max_body`` while they are being received.
+
+    Checks Content-Length up front and counts streamed bytes for chunked
+    requests, so an oversized upload is cut off before it is spooled to disk.
+    """
+
+    def __init__(self, app, path: str, max_body: int):
+        self.app = app
+        self.path = path
+        self.max_body = max_body
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        
+        detail = f"File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)}MB"
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+async def _store_upload(temp_path: Path, file_path: Path, media_type: str, sha256: str, previous_mtime: Optional[int]):
+    """Rename an upload into place, or drop it when the same file is already stored.
+
+    The existence check, rename, catalog update and reference count all
+    happen inside one update of media_refs.json, so a concurrent delete of
+    the last reference cannot remove the file in between. Returns
+    ``(references, catalog entry)``; the entry is None when deduplicated.
+    """
+    key = f"{media_type}/{file_path.name}"
+    stored = {}
+    
+    def add(refs: dict) -> dict:
+        if file_path.exists():
+            temp_path.unlink()
+            media_catalog.touch(media_type, previous_mtime)
+            stored["entry"] = None
+            return {**refs, key: refs.get(key, 0) + 1}
+        os.replace(temp_path, file_path)
+        stored["entry"] = media_catalog.add(media_type, file_path, sha256, previous_mtime)
+        return {**refs, key: 1}
+    
+    refs = await documents.update(MEDIA_REFS_DOCUMENT, add, {})
+    return refs[key], stored["entry"]
+
+
+async def _release_upload(media_type: str, filename: str) -> int:
+    """Drop one reference to an upload and return how many remain.
+
+    The last reference deletes the file, its catalog entry and its variants
+    inside the same update of media_refs.json that ``_store_upload`` uses.
+    """
+    key = f"{media_type}/{filename}"
+    
+    def release(refs: dict) -> dict:
+        refs = dict(refs)
+        remaining = refs.pop(key, 1) - 1
+        if remaining > 0:
+            refs[key] = remaining
+        else:
+            previous_mtime = media_catalog.dir_mtime(media_type)
+            (UPLOADS_DIR / media_type / filename).unlink(missing_ok=True)
+            media_catalog.remove(media_type, filename, previous_mtime)
+            if media_type == "images":
+                _remove_variants(filename)
+        return refs
+    
+    refs = await documents.update(MEDIA_REFS_DOCUMENT, release, {})
+    return refs.get(key, 0)
+
+
+def _variant_path(filename: str, width: int, ext: str) -> Path:
+    return VARIANTS_DIR / f"{Path(filename).stem}-{width}w.{ext}"
+
+
+def _full_webp_path(filename: str) -> Path:
+    return VARIANTS_DIR / f"{Path(filename).stem}-full.webp"
+
+
+def _save_variant(image, target: Path, fmt: str) -> None:
+    temp = target.with_name(f".{target.name}.part")
+    if fmt == "WEBP":
+        image.save(temp, fmt, quality=82, method=4)
+    else:
+        image.save(temp, fmt, quality=82, optimize=True, progressive=True)
+    os.replace(temp, target)
+
+
+def _generate_variants(source: Path) -> None:
+    """Write WebP/JPEG copies of ``source`` at each VARIANT_WIDTHS narrower than it.
+
+    A full-width WebP is also written for non-WebP sources when it comes out
+    smaller than the original. Runs on ``media_workers``.
+    """
+    try:
+        VARIANTS_DIR.mkdir(exist_ok=True)
+        with Image.open(source) as original:
+            image = original.convert("RGBA" if "A" in original.getbands() else "RGB")
+        
+        for width in [w for w in VARIANT_WIDTHS if w < image.width]:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            for ext, fmt in VARIANT_FORMATS.items():
+                target = _variant_path(source.name, width, ext)
+                if not target.exists():
+                    _save_variant(resized if fmt == "WEBP" else resized.convert("RGB"), target, fmt)
+        
+        if source.suffix.lower() != ".webp":
+            target = _full_webp_path(source.name)
+            if not target.exists():
+                _save_variant(image, target, "WEBP")
+                if target.stat().st_size >= source.stat().st_size:
+                    target.unlink()
+    except Exception as e:
+        logger.warning("Could not generate variants for %s: %s", source.name, e)
+
+
+def _pick_variant(filename: str, width: Optional[int], accepts_webp: bool) -> Optional[Path]:
+    """Best existing variant for a requested width and the client's Accept header.
+
+    Only the few names ``_generate_variants`` can write are stat'ed, so the
+    cost does not grow with the number of uploads.
+    """
+    if width is not None:
+        ext = "webp" if accepts_webp else "jpg"
+        for variant_width in VARIANT_WIDTHS:
+            if variant_width >= width:
+                path = _variant_path(filename, variant_width, ext)
+                if path.exists():
+                    return path
+    
+    # Wider than every variant, or no width given: only a full-size re-encode may stand in
+    full = _full_webp_path(filename)
+    return full if accepts_webp and full.exists() else None
+
+
+def _remove_variants(filename: str) -> None:
+    if VARIANTS_DIR.exists():
+        for path in VARIANTS_DIR.glob(f"{Path(filename).stem}-*"):
+            path.unlink(missing_ok=True)
+
+
+def _write_chunk(out, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def _stream_to_temp(file: UploadFile, directory: Path):
+    """Copy an upload into a temp file in ``directory`` without blocking the event loop.
+
+    Returns ``(temp_path, size, sha256_hex)``. Raises 413 as soon as the
+    content exceeds MAX_FILE_SIZE; the partial temp file is removed.
+    """
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    temp_path = Path(temp_name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            os.fchmod(out.fileno(), FILE_MODE)
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)}MB"
+                    )
+                await run_in_threadpool(_write_chunk, out, digest, chunk)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return temp_path, size, digest.hexdigest()
+
+
+# Media catalog
+MEDIA_TYPES = ("images", "videos")
+MEDIA_CATALOG_DOCUMENT = "media_catalog.json"
+# Background hashing saves the catalog after this many files
+MEDIA_HASH_BATCH = 50
+MP4_CONTAINER_BOXES = {b"moov", b"trak", b"mdia"}
+
+
+def _mp4_metadata(path: Path) -> dict:
+    """Duration (mvhd) and first visual track size (tkhd) from an MP4/MOV file"""
+    found = {}
+    
+    def walk(f, start: int, end: int) -> None:
+        offset = start
+        while offset + 8 <= end and len(found) < 3:
+            f.seek(offset)
+            size, box = struct.unpack(">I4s", f.read(8))
+            header = 8
+            if size == 1:
+                size = struct.unpack(">Q", f.read(8))[0]
+                header = 16
+            elif size == 0:
+                size = end - offset
+            if size < header:
+                return
+            if box in MP4_CONTAINER_BOXES:
+                walk(f, offset + header, offset + size)
+            elif box == b"mvhd":
+                version = f.read(4)[0]
+                if version == 1:
+                    f.seek(16, 1)
+                    timescale, duration = struct.unpack(">IQ", f.read(12))
+                else:
+                    f.seek(8, 1)
+                    timescale, duration = struct.unpack(">II", f.read(8))
+                if timescale:
+                    found["duration"] = round(duration / timescale, 3)
+            elif box == b"tkhd" and "width" not in found:
+                # Width and height are the last 8 bytes, as 16.16 fixed point
+                f.seek(offset + size - 8)
+                width, height = struct.unpack(">II", f.read(8))
+                if width and height:
+                    found["width"], found["height"] = width >> 16, height >> 16
+            offset += size
+    
+    with open(path, 'rb') as f:
+        walk(f, 0, path.stat().st_size)
+    return found
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _describe_media(media_type: str, path: Path, stat_result, sha256: Optional[str] = None) -> dict:
+    """Catalog entry for one uploaded file; reads headers only, so ``sha256`` stays None unless given"""
+    entry = {
+        "filename": path.name,
+        "url": f"/api/uploads/{media_type}/{path.name}",
+        "size": stat_result.st_size,
+        "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+        "mtime_ns": stat_result.st_mtime_ns,
+        "width": None,
+        "height": None,
+        "duration": None,
+        "sha256": sha256,
+    }
+    try:
+        if media_type == "images":
+            with Image.open(path) as image:
+                entry["width"], entry["height"] = image.size
+        elif path.suffix.lower() in (".mp4", ".mov"):
+            entry.update(_mp4_metadata(path))
+    except Exception:
+        # Unreadable or truncated files are still listed, just without metadata
+        pass
+    return entry
+
+
+class MediaCatalog:
+    """Metadata for every uploaded file, persisted in data/media_catalog.json.
+
+    Uploads and deletes update it directly. Each directory is rescanned
+    with os.scandir only when its mtime no longer matches the one recorded
+    at the last scan or catalog update. Listings are cached newest-first.
+    Methods block and are called through ``run_io``; a lock keeps
+    concurrent worker threads from interleaving. Changes are made under
+    the catalog document's file lock, after reloading it if another worker
+    process wrote it since, so no worker overwrites another's entries.
+
+    Files found by a rescan are listed straight away with ``sha256: None``;
+    ``schedule_hashing`` fills the hashes in on a background pool.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._files = None
+        self._dir_mtimes = {}
+        self._sorted = {}
+        self._lock = threading.RLock()
+        self._stale = False
+        # The catalog document this copy was loaded from or last saved as
+        self._document = None
+        self._needs_hashing = False
+        self._hashing = False
+
+    def _load(self) -> None:
+        stored = documents.load_sync(MEDIA_CATALOG_DOCUMENT)
+        if self._stale or self._files is None or stored is not self._document:
+            self._stale = False
+            self._document = stored
+            stored = stored or {}
+            self._files = {t: dict(stored.get("files", {}).get(t, {})) for t in MEDIA_TYPES}
+            self._dir_mtimes = dict(stored.get("dirs", {}))
+            self._sorted = {}
+            self._needs_hashing = True
+
+    @contextmanager
+    def _editing(self):
+        """Hold the process and cross-process locks with this copy brought up to date"""
+        with self._lock, _file_lock(documents.directory / MEDIA_CATALOG_DOCUMENT):
+            self._load()
+            yield
+
+    def _save(self) -> None:
+        self._document = {"dirs": self._dir_mtimes, "files": self._files}
+        documents.write_sync(MEDIA_CATALOG_DOCUMENT, self._document, locked=True)
+
+    def dir_mtime(self, media_type: str) -> Optional[int]:
+        """Directory mtime in ns, or None when it does not exist; take it before changing the directory"""
+        try:
+            return (self.root / media_type).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _reconcile(self, media_type: str, dir_mtime: Optional[int]) -> None:
+        known = self._files[media_type]
+        current = {}
+        directory = self.root / media_type
+        if dir_mtime is not None:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.name.startswith(".") or item.name.endswith((".br", ".gz")) or not item.is_file():
+                        continue
+                    st = item.stat()
+                    entry = known.get(item.name)
+                    if entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                        entry = _describe_media(media_type, Path(item.path), st)
+                    current[item.name] = entry
+        self._files[media_type] = current
+        self._dir_mtimes[media_type] = dir_mtime
+        self._sorted.pop(media_type, None)
+        self._needs_hashing = True
+
+    def refresh(self) -> None:
+        """Rescan directories whose mtime changed; blocking, run it in a worker thread"""
+        with self._lock:
+            self._load()
+            if all(self.dir_mtime(t) == self._dir_mtimes.get(t) for t in MEDIA_TYPES):
+                return
+        with self._editing():
+            changed = False
+            for media_type in MEDIA_TYPES:
+                dir_mtime = self.dir_mtime(media_type)
+                if dir_mtime != self._dir_mtimes.get(media_type):
+                    self._reconcile(media_type, dir_mtime)
+                    changed = True
+            if changed:
+                self._save()
+
+    def _advance(self, media_type: str, previous: Optional[int]) -> None:
+        """Record the directory's new mtime, but only if this copy matched it before the change.
+
+        Otherwise the directory holds files that were never scanned, and the
+        stale mtime makes the next ``refresh`` pick them up.
+        """
+        if self._dir_mtimes.get(media_type) == previous:
+            self._dir_mtimes[media_type] = self.dir_mtime(media_type)
+
+    def add(self, media_type: str, path: Path, sha256: str, previous: Optional[int]) -> dict:
+        """Catalog a new file and return its public listing entry.
+
+        ``previous`` is ``dir_mtime(media_type)`` from before the upload
+        touched the directory.
+        """
+        with self._editing():
+            entry = self._files[media_type][path.name] = _describe_media(media_type, path, path.stat(), sha256)
+            self._advance(media_type, previous)
+            self._sorted.pop(media_type, None)
+            self._save()
+        return {k: v for k, v in entry.items() if k != "mtime_ns"}
+
+    def remove(self, media_type: str, filename: str, previous: Optional[int]) -> None:
+        with self._editing():
+            self._files[media_type].pop(filename, None)
+            self._advance(media_type, previous)
+            self._sorted.pop(media_type, None)
+            self._save()
+
+    def invalidate(self) -> None:
+        """Reload from the catalog document on next use; safe to call without the lock"""
+        self._stale = True
+
+    def touch(self, media_type: str, previous: Optional[int]) -> None:
+        """Record the directory's current mtime after a change that left the listing as is"""
+        with self._lock:
+            self._load()
+            self._advance(media_type, previous)
+
+    def schedule_hashing(self, executor) -> None:
+        """Hash entries listed without a sha256 on ``executor``, unless that is running or nothing changed"""
+        with self._lock:
+            if self._hashing or not self._needs_hashing:
+                return
+            self._needs_hashing = False
+            self._hashing = True
+        executor.submit(self._hash_pending)
+
+    def _hash_pending(self) -> None:
+        try:
+            with self._lock:
+                self._load()
+                pending = [
+                    (media_type, name, entry["size"], entry["mtime_ns"])
+                    for media_type in MEDIA_TYPES
+                    for name, entry in self._files[media_type].items()
+                    if entry.get("sha256") is None
+                ]
+            # Hash without holding the locks, then store batches of results
+            for start in range(0, len(pending), MEDIA_HASH_BATCH):
+                hashed = []
+                for media_type, name, size, mtime_ns in pending[start:start + MEDIA_HASH_BATCH]:
+                    try:
+                        hashed.append((media_type, name, size, mtime_ns, _file_sha256(self.root / media_type / name)))
+                    except FileNotFoundError:
+                        continue
+                self._store_hashes(hashed)
+        except Exception:
+            logger.exception("Hashing media catalog entries failed")
+        finally:
+            self._hashing = False
+
+    def _store_hashes(self, hashed: List[tuple]) -> None:
+        if not hashed:
+            return
+        with self._editing():
+            for media_type, name, size, mtime_ns, digest in hashed:
+                entry = self._files[media_type].get(name)
+                # Skip files replaced while they were being hashed
+                if entry is not None and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+                    self._files[media_type][name] = {**entry, "sha256": digest}
+                    self._sorted.pop(media_type, None)
+            self._save()
+
+    def listing(self, media_type: str) -> List[dict]:
+        with self._lock:
+            if media_type not in self._sorted:
+                entries = sorted(self._files[media_type].values(), key=lambda e: e["mtime_ns"], reverse=True)
+                self._sorted[media_type] = [
+                    {k: v for k, v in e.items() if k != "mtime_ns"} for e in entries
+                ]
+            return self._sorted[media_type]
+
+
+media_catalog = MediaCatalog(UPLOADS_DIR)
 
 
 @api_router.get("/uploads/{media_type}/{filename}")
-async def serve_upload(media_type: str, filename: str):
-    """Serve uploaded files through /api route for ingress compatibility"""
+async def serve_upload(request: Request, media_type: str, filename: str, w: Optional[int] = Query(None, ge=1)):
+    """Serve uploaded files through /api route for ingress compatibility.
+
+    For images, ``w`` selects the smallest resized variant at least that
+    wide, and WebP is preferred when the client accepts it.
+    """
     if media_type not in ["images", "videos"]:
         raise HTTPException(status_code=400, detail="Invalid media type")
     
@@ -589,7 +2821,21 @@ async def serve_upload(media_type: str, filename: str):
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(path=file_path)
+    # Upload names are content hashes or random ids, so a URL never changes content
+    if media_type == "images":
+        accepts_webp = "image/webp" in request.headers.get("accept", "")
+        variant = _pick_variant(filename, w, accepts_webp)
+        # The original standing in for a resized variant may only be a placeholder until
+        # the variant is written, so it must not be cached under the ?w= URL for good
+        placeholder = variant is None and w is not None and w <= VARIANT_WIDTHS[-1]
+        return _file_response(
+            request,
+            variant or file_path,
+            cache_control="no-cache" if placeholder else IMMUTABLE_CACHE_CONTROL,
+            headers={"Vary": "Accept"},
+        )
+    
+    return _file_response(request, file_path, cache_control=IMMUTABLE_CACHE_CONTROL)
 
 
 @api_router.post("/upload")
@@ -606,26 +2852,37 @@ async def upload_file(file: UploadFile = File(...)):
             detail="File type not allowed. Allowed: images (jpeg, png, gif, webp) and videos (mp4, webm, mov, avi)"
         )
     
-    # Generate unique filename
-    file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
-    unique_filename = f"{uuid.uuid4().hex}.{file_ext}"
-    
     # Determine subfolder
     subfolder = "images" if is_image else "videos"
     upload_path = UPLOADS_DIR / subfolder
     upload_path.mkdir(exist_ok=True)
+    previous_mtime = await run_io(media_catalog.dir_mtime, subfolder)
     
-    file_path = upload_path / unique_filename
-    
-    # Save file
+    # Save file: stream to a temp file in the same directory, then rename into place
     try:
-        with open(file_path, 'wb') as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        temp_path, file_size, sha256 = await _stream_to_temp(file, upload_path)
+        
+        if CONTENT_ADDRESSED_UPLOADS:
+            unique_filename = f"{sha256[:32]}.{CANONICAL_EXTENSIONS[content_type]}"
+        else:
+            # Generate unique filename
+            file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
+            unique_filename = f"{uuid.uuid4().hex}.{file_ext}"
+        file_path = upload_path / unique_filename
+        
+        # Same content already stored: keep the existing copy and count a reference to it
+        references, entry = await _store_upload(temp_path, file_path, subfolder, sha256, previous_mtime)
+        deduplicated = entry is None
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
-    # Get file info
-    file_size = os.path.getsize(file_path)
+    if not deduplicated:
+        change_feed.publish("media", "upsert", f"{subfolder}/{unique_filename}", entry)
+    
+    if content_type in VARIANT_SOURCE_TYPES and not deduplicated:
+        media_workers.submit(_generate_variants, file_path)
     
     # Build URL - use /api/uploads path for ingress compatibility
     relative_url = f"/api/uploads/{subfolder}/{unique_filename}"
@@ -637,49 +2894,36 @@ async def upload_file(file: UploadFile = File(...)):
         "type": "image" if is_image else "video",
         "content_type": content_type,
         "size": file_size,
+        "sha256": sha256,
+        "deduplicated": deduplicated,
+        "references": references,
         "url": relative_url
     }
 
 
 @api_router.get("/media")
-async def list_media():
-    """List all uploaded media files"""
-    media = {"images": [], "videos": []}
-    
-    # List images
-    images_dir = UPLOADS_DIR / "images"
-    if images_dir.exists():
-        for file in images_dir.iterdir():
-            if file.is_file():
-                media["images"].append({
-                    "filename": file.name,
-                    "url": f"/api/uploads/images/{file.name}",
-                    "size": os.path.getsize(file),
-                    "modified": datetime.fromtimestamp(os.path.getmtime(file)).isoformat()
-                })
-    
-    # List videos
-    videos_dir = UPLOADS_DIR / "videos"
-    if videos_dir.exists():
-        for file in videos_dir.iterdir():
-            if file.is_file():
-                media["videos"].append({
-                    "filename": file.name,
-                    "url": f"/api/uploads/videos/{file.name}",
-                    "size": os.path.getsize(file),
-                    "modified": datetime.fromtimestamp(os.path.getmtime(file)).isoformat()
-                })
-    
-    # Sort by modified date (newest first)
-    media["images"].sort(key=lambda x: x["modified"], reverse=True)
-    media["videos"].sort(key=lambda x: x["modified"], reverse=True)
+async def list_media(offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=1000)):
+    """List uploaded media files from the catalog, newest first.
+
+    ``offset``/``limit`` page each list independently; ``total`` gives the
+    full counts.
+    """
+    await run_io(media_catalog.refresh)
+    media_catalog.schedule_hashing(media_workers)
+    
+    media = {"images": [], "videos": [], "total": {}}
+    for media_type in MEDIA_TYPES:
+        entries = media_catalog.listing(media_type)
+        end = offset + limit if limit is not None else None
+        media[media_type] = entries[offset:end]
+        media["total"][media_type] = len(entries)
     
     return media
 
 
 @api_router.delete("/media/{media_type}/{filename}")
 async def delete_media(media_type: str, filename: str):
-    """Delete a media file"""
+    """Delete a media file, or one reference to it when it was uploaded more than once"""
     if media_type not in ["images", "videos"]:
         raise HTTPException(status_code=400, detail="Invalid media type")
     
@@ -689,36 +2933,138 @@ async def delete_media(media_type: str, filename: str):
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
-        os.remove(file_path)
-        return {"success": True, "message": "File deleted successfully"}
+        remaining = await _release_upload(media_type, filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete file: {str(e)}")
+    
+    if remaining > 0:
+        return {"success": True, "message": "Reference removed, file still in use", "references": remaining}
+    
+    change_feed.publish("media", "delete", f"{media_type}/{filename}")
+    return {"success": True, "message": "File deleted successfully", "references": 0}
 
 
 # Quotes endpoints
 @api_router.get("/quotes")
-async def get_all_quotes():
+async def get_all_quotes(request: Request):
     """Get all quotes"""
-    quotes_file = ROOT_DIR / "data" / "quotes.json"
-    
-    if quotes_file.exists():
-        with open(quotes_file, 'r') as f:
-            return json.load(f)
-    
-    return []
+    return _json_response(request, await _document_body("quotes.json", []))
 
 
 @api_router.put("/quotes")
 async def update_quotes(quotes: List[dict]):
     """Update all quotes"""
-    quotes_file = ROOT_DIR / "data" / "quotes.json"
-    
-    with open(quotes_file, 'w') as f:
-        json.dump(quotes, f, indent=2)
+    await documents.write("quotes.json", quotes)
+    daily_quotes.invalidate()
+    change_feed.publish("quotes", "upsert", data=quotes)
     
     return {"message": "Quotes updated successfully", "count": len(quotes)}
 
 
+# Aggregated page-load endpoint
+async def _quote_body() -> JsonBody:
+    return await daily_quotes.body(_local_now().date())
+
+
+BOOTSTRAP_SECTIONS = {
+    "projects": _projects_body,
+    "skills": _skills_body,
+    "stats": _stats_body,
+    "config": _config_body,
+    "quote": _quote_body,
+}
+
+
+@api_router.get("/bootstrap")
+async def get_bootstrap(request: Request, include: Optional[str] = None):
+    """Everything a page needs in one response, e.g. ``?include=skills,stats``.
+
+    Sections are gathered concurrently and spliced together from their own
+    pre-serialized bodies, so nothing is re-encoded. Omitting ``include``
+    returns every section.
+    """
+    names = [n.strip() for n in include.split(",") if n.strip()] if include else list(BOOTSTRAP_SECTIONS)
+    unknown = [n for n in names if n not in BOOTSTRAP_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    names = list(dict.fromkeys(names))
+    
+    bodies = await asyncio.gather(*(BOOTSTRAP_SECTIONS[name]() for name in names))
+    content = b"{" + b",".join(
+        json.dumps(name).encode() + b":" + body.content for name, body in zip(names, bodies)
+    ) + b"}"
+    etag_source = ",".join(f"{name}={body.etag}" for name, body in zip(names, bodies))
+    body = JsonBody(content, f'"{hashlib.sha256(etag_source.encode()).hexdigest()[:32]}"')
+    
+    # Compressed on the way out by CompressionMiddleware
+    return _json_response(request, body)
+
+
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for the data/*.json document cache and the record snapshots"""
+    return {**documents.stats(), "snapshots": {name: snapshot.stats() for name, snapshot in snapshots.items()}}
+
+
+# MongoDB query-plan diagnostics
+# (collection, filter, sort) for the queries the handlers above send to storage; list
+# reads are served from the record snapshots
+HOT_QUERIES = [
+    # get/replace/delete by id, and max_id when numbering new records
+    ("projects", {"id": 1}, None),
+    ("projects", {}, [("id", DESCENDING)]),
+    ("skills", {"id": 1}, None),
+    ("skills", {}, [("id", DESCENDING)]),
+    ("contact_messages", {}, INBOX_SORT),
+    ("status_checks", {}, INBOX_SORT),
+]
+
+
+def _plan_stages(plan) -> List[str]:
+    """All stage names in an explain() plan tree"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+@api_router.get("/admin/query-plans")
+async def check_query_plans():
+    """Run explain() on each hot query and flag any that fall back to a collection scan.
+
+    Only meaningful for the Mongo backend; the others report no queries.
+    """
+    if not isinstance(storage, MongoStorage):
+        return {"ok": True, "backend": storage.name, "queries": []}
+    
+    results = []
+    for collection, query, sort in HOT_QUERIES:
+        cursor = storage.db[collection].find(query, {"_id": 0})
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        results.append({
+            "collection": collection,
+            "filter": query,
+            "sort": sort,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+    
+    return {
+        "ok": not any(r["collscan"] for r in results),
+        "backend": storage.name,
+        "queries": results,
+    }
+
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -728,8 +3074,13 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+app.add_middleware(UploadLimitMiddleware, path="/api/upload", max_body=MAX_FILE_SIZE + MULTIPART_OVERHEAD)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -737,6 +3088,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def prepare_storage():
+    await storage.prepare()
+    if not storage.persistent:
+        # Nothing survives a restart, so start from the JSON documents
+        for name in ("projects", "skills"):
+            await sync_collection(name, await documents.load(f"{name}.json", []))
+
+@app.on_event("startup")
+async def start_write_behind():
+    if write_behind.enabled and WRITE_BEHIND_SPILL.exists():
+        await write_behind.replay()
+    write_behind.start()
+
+@app.on_event("startup")
+async def start_worker_sync():
+    if MULTI_WORKER and not storage.persistent:
+        logger.warning("MULTI_WORKER with the %s backend: each worker keeps its own copy of the data", storage.name)
+    worker_generations.start()
+
+@app.on_event("startup")
+async def start_snapshot_watcher():
+    global snapshot_watcher
+    if not SNAPSHOT_CHANGE_STREAM:
+        return
+    if not storage.can_watch:
+        logger.warning("SNAPSHOT_CHANGE_STREAM is set but the %s backend cannot watch for changes", storage.name)
+        return
+    snapshot_watcher = asyncio.create_task(watch_snapshots())
+
+@app.on_event("startup")
+async def precompress_static_files():
+    media_workers.submit(_precompress_tree, ROOT_DIR / "static")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    if snapshot_watcher is not None:
+        snapshot_watcher.cancel()
+    await worker_generations.stop()
+    await write_behind.stop()
+    await storage.close()
+    media_workers.shutdown(wait=False)
+    data_io.shutdown(wait=True)
@@ -0,0 +1,738 @@
+"""
+Storage backends for the portfolio API.
+
+Projects and skills are *records*: JSON documents keyed by an integer
+``id``. Contact messages and status checks are *inbox* entries: documents
+keyed by a string ``id`` and read newest first by ``(timestamp, id)``.
+Every backend exposes the same repositories for both, plus the id
+sequences used to number new records:
+
+- ``MongoStorage`` - Motor/MongoDB, the default
+- ``SQLiteStorage`` - an embedded SQLite file in WAL mode
+- ``MemoryStorage`` - plain dicts; nothing survives a restart
+
+``open_storage`` picks one by name.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, DeleteMany, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+RECORD_COLLECTIONS = ("projects", "skills")
+INBOX_COLLECTIONS = ("contact_messages", "status_checks")
+# Newest first; id breaks ties between entries written in the same instant
+INBOX_SORT = [("timestamp", DESCENDING), ("id", DESCENDING)]
+# Position of the last entry a client has seen: (timestamp, id)
+InboxCursor = Tuple[datetime, str]
+
+
+class StorageUnavailable(Exception):
+    """The backend could not be reached; the write may be retried later"""
+
+
+class RecordFilter(NamedTuple):
+    """Equality filters on records; ``tags`` matches records with any of the tags"""
+
+    category: Optional[str] = None
+    featured: Optional[bool] = None
+    year: Optional[int] = None
+    tags: Optional[List[str]] = None
+
+    def matches(self, record: dict) -> bool:
+        if self.category is not None and record.get("category") != self.category:
+            return False
+        # Records without the field count as not featured
+        if self.featured is not None and bool(record.get("featured")) != self.featured:
+            return False
+        if self.year is not None and record.get("year") != self.year:
+            return False
+        if self.tags and not set(self.tags).intersection(record.get("tags") or []):
+            return False
+        return True
+
+
+def _utc(stamp: datetime) -> datetime:
+    """Treat naive datetimes as UTC so stamps from any backend compare consistently"""
+    return stamp.replace(tzinfo=timezone.utc) if stamp.tzinfo is None else stamp.astimezone(timezone.utc)
+
+
+def _stamp_key(stamp: datetime) -> str:
+    """Fixed-width UTC text form of a timestamp; sorts the same way the datetimes do"""
+    return _utc(stamp).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+class RecordRepository(ABC):
+    """Integer-keyed records (projects, skills)"""
+
+    @abstractmethod
+    async def all(self) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get(self, record_id: int) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def max_id(self) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    async def insert(self, record: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def replace(self, record_id: int, record: dict) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, record_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def apply(self, upserts: List[dict], delete_ids: List[int]) -> Tuple[int, int, int]:
+        """Upsert and delete in one batch; returns ``(inserted, updated, deleted)``"""
+
+
+class InboxRepository(ABC):
+    """String-keyed entries read newest first (contact messages, status checks)"""
+
+    @abstractmethod
+    async def add(self, doc: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def add_many(self, docs: List[dict]) -> int:
+        """Insert a batch; returns how many were rejected individually (e.g. duplicate ids).
+
+        Raises ``StorageUnavailable`` when nothing could be written.
+        """
+
+    @abstractmethod
+    async def page(self, after: Optional[InboxCursor], limit: int) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def scan(self, after: Optional[InboxCursor]) -> AsyncIterator[dict]:
+        """Every entry after ``after``, newest first, without loading them all at once"""
+
+    async def migrate_timestamps(self) -> int:
+        """Normalize timestamps written by older versions; returns how many changed"""
+        return 0
+
+
+class Storage(ABC):
+    name = ""
+    # False when data does not outlive the process
+    persistent = True
+    # True when ``watch`` reports changes made by other processes
+    can_watch = False
+
+    def __init__(self, records: Dict[str, RecordRepository], inboxes: Dict[str, InboxRepository]):
+        self._records = records
+        self._inboxes = inboxes
+        self.projects = records["projects"]
+        self.skills = records["skills"]
+        self.contact_messages = inboxes["contact_messages"]
+        self.status_checks = inboxes["status_checks"]
+
+    def records(self, name: str) -> RecordRepository:
+        return self._records[name]
+
+    def inbox(self, name: str) -> InboxRepository:
+        return self._inboxes[name]
+
+    @abstractmethod
+    async def raise_sequence(self, name: str, value: int) -> None:
+        """Move the sequence for ``name`` up to ``value`` if it is lower"""
+
+    @abstractmethod
+    async def next_sequence(self, name: str) -> int:
+        """Atomically increment and return the sequence for ``name``"""
+
+    async def prepare(self) -> None:
+        """Create indexes and run migrations; called once at startup"""
+
+    def watch(self, names: List[str]) -> AsyncIterator[str]:
+        """Yield the name of a collection in ``names`` each time any process changes it.
+
+        Optional: only called on backends that set ``can_watch``.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+# MongoDB
+MONGO_INDEXES = {
+    "projects": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+    ],
+    "skills": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+    ],
+    "contact_messages": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+        (INBOX_SORT, {"name": "timestamp_id_desc"}),
+    ],
+    "status_checks": [
+        ([("id", ASCENDING)], {"name": "id_unique", "unique": True}),
+        (INBOX_SORT, {"name": "timestamp_id_desc"}),
+    ],
+}
+EXPORT_BATCH_SIZE = 500
+
+
+class MongoRecords(RecordRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def all(self) -> List[dict]:
+        return await self.collection.find({}, {"_id": 0}).to_list(None)
+
+    async def get(self, record_id: int) -> Optional[dict]:
+        return await self.collection.find_one({"id": record_id}, {"_id": 0})
+
+    async def max_id(self) -> Optional[int]:
+        latest = await self.collection.find_one({}, {"_id": 0, "id": 1}, sort=[("id", DESCENDING)])
+        return latest["id"] if latest else None
+
+    async def insert(self, record: dict) -> None:
+        # Copy so the driver's generated _id never leaks into the caller's dict
+        await self.collection.insert_one(dict(record))
+
+    async def replace(self, record_id: int, record: dict) -> bool:
+        result = await self.collection.replace_one({"id": record_id}, dict(record))
+        return result.matched_count > 0
+
+    async def delete(self, record_id: int) -> bool:
+        result = await self.collection.delete_one({"id": record_id})
+        return result.deleted_count > 0
+
+    async def apply(self, upserts, delete_ids):
+        operations = [ReplaceOne({"id": r["id"]}, dict(r), upsert=True) for r in upserts]
+        if delete_ids:
+            operations.append(DeleteMany({"id": {"$in": list(delete_ids)}}))
+        if not operations:
+            return 0, 0, 0
+        result = await self.collection.bulk_write(operations, ordered=True)
+        return result.upserted_count, result.modified_count, result.deleted_count
+
+
+class MongoInbox(InboxRepository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    @staticmethod
+    def _after(after: Optional[InboxCursor]) -> dict:
+        if after is None:
+            return {}
+        stamp, last_id = after
+        return {"$or": [
+            {"timestamp": {"$lt": stamp}},
+            {"timestamp": stamp, "id": {"$lt": last_id}},
+        ]}
+
+    async def add(self, doc: dict) -> None:
+        await self.collection.insert_one(dict(doc))
+
+    async def add_many(self, docs: List[dict]) -> int:
+        try:
+            await self.collection.insert_many([dict(doc) for doc in docs], ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if errors:
+                logger.warning("%s rejected %d document(s): %s", self.collection.name, len(errors), errors[0]["errmsg"])
+            return len(errors)
+        except PyMongoError as e:
+            raise StorageUnavailable(str(e)) from e
+        return 0
+
+    async def page(self, after, limit) -> List[dict]:
+        cursor = self.collection.find(self._after(after), {"_id": 0}).sort(INBOX_SORT).limit(limit)
+        return await cursor.to_list(None)
+
+    async def scan(self, after):
+        cursor = self.collection.find(self._after(after), {"_id": 0}).sort(INBOX_SORT).batch_size(EXPORT_BATCH_SIZE)
+        async for doc in cursor:
+            yield doc
+
+    async def migrate_timestamps(self) -> int:
+        """Convert timestamps stored as ISO strings by older versions into BSON dates"""
+        updates = []
+        async for doc in self.collection.find({"timestamp": {"$type": "string"}}, {"_id": 1, "timestamp": 1}):
+            try:
+                stamp = datetime.fromisoformat(doc["timestamp"])
+            except ValueError:
+                logger.warning("Unparseable timestamp on %s %s", self.collection.name, doc["_id"])
+                continue
+            updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"timestamp": _utc(stamp)}}))
+        if updates:
+            await self.collection.bulk_write(updates, ordered=False)
+        return len(updates)
+
+
+class MongoStorage(Storage):
+    name = "mongo"
+    # Change streams need a replica set (a single-node one is enough)
+    can_watch = True
+
+    def __init__(self, db):
+        self.db = db
+        super().__init__(
+            {name: MongoRecords(db[name]) for name in RECORD_COLLECTIONS},
+            {name: MongoInbox(db[name]) for name in INBOX_COLLECTIONS},
+        )
+
+    async def raise_sequence(self, name: str, value: int) -> None:
+        await self.db.counters.update_one({"_id": name}, {"$max": {"seq": value}}, upsert=True)
+
+    async def next_sequence(self, name: str) -> int:
+        counter = await self.db.counters.find_one_and_update(
+            {"_id": name},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return counter["seq"]
+
+    async def prepare(self) -> None:
+        for name in INBOX_COLLECTIONS:
+            migrated = await self.inbox(name).migrate_timestamps()
+            if migrated:
+                logger.info("Migrated %d string timestamps on %s", migrated, name)
+        # Index failures are logged, not raised
+        for collection, specs in MONGO_INDEXES.items():
+            for keys, options in specs:
+                try:
+                    await self.db[collection].create_index(keys, **options)
+                except Exception as e:
+                    logger.warning("Could not create index %s on %s: %s", options["name"], collection, e)
+
+    async def watch(self, names):
+        names = list(names)
+        async with self.db.watch([{"$match": {"$or": [
+            {"ns.coll": {"$in": names}},
+            {"operationType": {"$in": ["dropDatabase", "invalidate"]}},
+        ]}}]) as stream:
+            async for change in stream:
+                collection = change.get("ns", {}).get("coll")
+                # Database-wide events have no collection: every name is affected
+                for name in [collection] if collection in names else names:
+                    yield name
+
+    async def close(self) -> None:
+        self.db.client.close()
+
+
+# SQLite
+# Threads (each with its own connection) that run SQLite reads
+SQLITE_READERS = 4
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    collection TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inbox (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS inbox_timestamp_id_desc ON inbox (collection, timestamp DESC, id DESC);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+
+def _dumps(doc: dict) -> str:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def _inbox_row(collection: str, doc: dict) -> tuple:
+    body = {k: v for k, v in doc.items() if k != "timestamp"}
+    return collection, doc["id"], _stamp_key(doc["timestamp"]), _dumps(body)
+
+
+def _inbox_doc(timestamp: str, body: str) -> dict:
+    doc = json.loads(body)
+    doc["timestamp"] = datetime.fromisoformat(timestamp)
+    return doc
+
+
+class SQLiteDatabase:
+    """A WAL-mode SQLite file with one writer thread and a small reader pool.
+
+    Writes run on a dedicated thread, so waiting on a lock or a checkpoint
+    never blocks the event loop. Reads run on ``SQLITE_READERS`` threads
+    with one connection each; in WAL mode they never wait for the writer,
+    and a page cache miss stalls only the reading thread, not every request.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._readers = ThreadPoolExecutor(max_workers=SQLITE_READERS, thread_name_prefix="sqlite-read")
+        self._writer = None
+        self._local = threading.local()
+        self._reader_connections = []
+        self._reader_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(SQLITE_SCHEMA)
+        return conn
+
+    def _writer_connection(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._open()
+        return self._writer
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            with self._reader_lock:
+                self._reader_connections.append(conn)
+        return conn
+
+    async def run(self, func, *args):
+        """Run ``func(connection, *args)`` on the writer thread"""
+        def call():
+            return func(self._writer_connection(), *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except sqlite3.OperationalError as e:
+            raise StorageUnavailable(str(e)) from e
+
+    async def read(self, func, *args):
+        """Run ``func(connection, *args)`` on a reader thread's own connection"""
+        def call():
+            return func(self._reader_connection(), *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._readers, call)
+        except sqlite3.OperationalError as e:
+            raise StorageUnavailable(str(e)) from e
+
+    async def close(self) -> None:
+        def close():
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, close)
+        self._executor.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with self._reader_lock:
+            for conn in self._reader_connections:
+                conn.close()
+            self._reader_connections.clear()
+
+
+class SQLiteRecords(RecordRepository):
+    def __init__(self, database: SQLiteDatabase, collection: str):
+        self.database = database
+        self.collection = collection
+
+    def _all(self, conn) -> List[dict]:
+        rows = conn.execute("SELECT body FROM records WHERE collection = ? ORDER BY id", (self.collection,))
+        return [json.loads(body) for body, in rows]
+
+    async def all(self) -> List[dict]:
+        return await self.database.read(self._all)
+
+    async def get(self, record_id: int) -> Optional[dict]:
+        def get(conn):
+            row = conn.execute(
+                "SELECT body FROM records WHERE collection = ? AND id = ?", (self.collection, record_id)
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+        return await self.database.read(get)
+
+    async def max_id(self) -> Optional[int]:
+        def max_id(conn):
+            return conn.execute("SELECT MAX(id) FROM records WHERE collection = ?", (self.collection,)).fetchone()[0]
+        return await self.database.read(max_id)
+
+    async def insert(self, record: dict) -> None:
+        def insert(conn):
+            conn.execute(
+                "INSERT INTO records (collection, id, body) VALUES (?, ?, ?)",
+                (self.collection, record["id"], _dumps(record)),
+            )
+        await self.database.run(insert)
+
+    async def replace(self, record_id: int, record: dict) -> bool:
+        def replace(conn):
+            cursor = conn.execute(
+                "UPDATE records SET body = ? WHERE collection = ? AND id = ?",
+                (_dumps(record), self.collection, record_id),
+            )
+            return cursor.rowcount > 0
+        return await self.database.run(replace)
+
+    async def delete(self, record_id: int) -> bool:
+        def delete(conn):
+            cursor = conn.execute("DELETE FROM records WHERE collection = ? AND id = ?", (self.collection, record_id))
+            return cursor.rowcount > 0
+        return await self.database.run(delete)
+
+    async def apply(self, upserts, delete_ids):
+        def apply(conn):
+            inserted = updated = deleted = 0
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record in upserts:
+                    body = _dumps(record)
+                    cursor = conn.execute(
+                        "UPDATE records SET body = ? WHERE collection = ? AND id = ?",
+                        (body, self.collection, record["id"]),
+                    )
+                    if cursor.rowcount:
+                        updated += 1
+                    else:
+                        conn.execute(
+                            "INSERT INTO records (collection, id, body) VALUES (?, ?, ?)",
+                            (self.collection, record["id"], body),
+                        )
+                        inserted += 1
+                for record_id in delete_ids:
+                    deleted += conn.execute(
+                        "DELETE FROM records WHERE collection = ? AND id = ?", (self.collection, record_id)
+                    ).rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return inserted, updated, deleted
+        return await self.database.run(apply)
+
+
+class SQLiteInbox(InboxRepository):
+    def __init__(self, database: SQLiteDatabase, collection: str):
+        self.database = database
+        self.collection = collection
+
+    def _select(self, after: Optional[InboxCursor], limit: int):
+        if after is None:
+            return (
+                "SELECT timestamp, body FROM inbox WHERE collection = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (self.collection, limit),
+            )
+        key = _stamp_key(after[0])
+        return (
+            "SELECT timestamp, body FROM inbox WHERE collection = ? "
+            "AND (timestamp < ? OR (timestamp = ? AND id < ?)) "
+            "ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (self.collection, key, key, after[1], limit),
+        )
+
+    async def add(self, doc: dict) -> None:
+        def add(conn):
+            conn.execute("INSERT INTO inbox VALUES (?, ?, ?, ?)", _inbox_row(self.collection, doc))
+        await self.database.run(add)
+
+    async def add_many(self, docs: List[dict]) -> int:
+        def add_many(conn):
+            rows = [_inbox_row(self.collection, doc) for doc in docs]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.executemany("INSERT OR IGNORE INTO inbox VALUES (?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return len(rows) - cursor.rowcount
+        return await self.database.run(add_many)
+
+    async def page(self, after, limit) -> List[dict]:
+        def page(conn):
+            return [_inbox_doc(*row) for row in conn.execute(*self._select(after, limit))]
+        return await self.database.read(page)
+
+    async def scan(self, after):
+        while True:
+            batch = await self.page(after, EXPORT_BATCH_SIZE)
+            for doc in batch:
+                yield doc
+            if len(batch) < EXPORT_BATCH_SIZE:
+                return
+            after = (batch[-1]["timestamp"], batch[-1]["id"])
+
+
+class SQLiteStorage(Storage):
+    name = "sqlite"
+
+    def __init__(self, path: Path):
+        self.database = SQLiteDatabase(path)
+        super().__init__(
+            {name: SQLiteRecords(self.database, name) for name in RECORD_COLLECTIONS},
+            {name: SQLiteInbox(self.database, name) for name in INBOX_COLLECTIONS},
+        )
+
+    async def raise_sequence(self, name: str, value: int) -> None:
+        def raise_sequence(conn):
+            conn.execute(
+                "INSERT INTO counters (name, seq) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET seq = MAX(seq, excluded.seq)",
+                (name, value),
+            )
+        await self.database.run(raise_sequence)
+
+    async def next_sequence(self, name: str) -> int:
+        def next_sequence(conn):
+            return conn.execute(
+                "INSERT INTO counters (name, seq) VALUES (?, 1) "
+                "ON CONFLICT (name) DO UPDATE SET seq = seq + 1 RETURNING seq",
+                (name,),
+            ).fetchone()[0]
+        return await self.database.run(next_sequence)
+
+    async def prepare(self) -> None:
+        # Opens the file and creates the schema
+        await self.database.run(lambda conn: None)
+
+    async def close(self) -> None:
+        await self.database.close()
+
+
+# In-memory
+class MemoryRecords(RecordRepository):
+    def __init__(self):
+        self._records = {}
+
+    async def all(self) -> List[dict]:
+        return [self._records[i] for i in sorted(self._records)]
+
+    async def get(self, record_id: int) -> Optional[dict]:
+        return self._records.get(record_id)
+
+    async def max_id(self) -> Optional[int]:
+        return max(self._records, default=None)
+
+    async def insert(self, record: dict) -> None:
+        self._records[record["id"]] = dict(record)
+
+    async def replace(self, record_id: int, record: dict) -> bool:
+        if record_id not in self._records:
+            return False
+        self._records[record_id] = dict(record)
+        return True
+
+    async def delete(self, record_id: int) -> bool:
+        return self._records.pop(record_id, None) is not None
+
+    async def apply(self, upserts, delete_ids):
+        inserted = updated = deleted = 0
+        for record in upserts:
+            if record["id"] in self._records:
+                updated += 1
+            else:
+                inserted += 1
+            self._records[record["id"]] = dict(record)
+        for record_id in delete_ids:
+            if self._records.pop(record_id, None) is not None:
+                deleted += 1
+        return inserted, updated, deleted
+
+
+class MemoryInbox(InboxRepository):
+    """Entries kept in ascending ``(timestamp, id)`` order, so pages are slices read backwards"""
+
+    def __init__(self):
+        self._keys = []
+        self._docs = []
+        self._ids = set()
+
+    def _insert(self, doc: dict) -> bool:
+        if doc["id"] in self._ids:
+            return False
+        key = (_stamp_key(doc["timestamp"]), doc["id"])
+        index = bisect.bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._docs.insert(index, dict(doc))
+        self._ids.add(doc["id"])
+        return True
+
+    def _end(self, after: Optional[InboxCursor]) -> int:
+        if after is None:
+            return len(self._keys)
+        return bisect.bisect_left(self._keys, (_stamp_key(after[0]), after[1]))
+
+    async def add(self, doc: dict) -> None:
+        if not self._insert(doc):
+            raise ValueError(f"Duplicate id {doc['id']}")
+
+    async def add_many(self, docs: List[dict]) -> int:
+        return sum(not self._insert(doc) for doc in docs)
+
+    async def page(self, after, limit) -> List[dict]:
+        end = self._end(after)
+        return self._docs[max(end - limit, 0):end][::-1]
+
+    async def scan(self, after):
+        while True:
+            batch = await self.page(after, EXPORT_BATCH_SIZE)
+            for doc in batch:
+                yield doc
+            if len(batch) < EXPORT_BATCH_SIZE:
+                return
+            after = (batch[-1]["timestamp"], batch[-1]["id"])
+
+
+class MemoryStorage(Storage):
+    name = "memory"
+    persistent = False
+
+    def __init__(self):
+        self._sequences = {}
+        super().__init__(
+            {name: MemoryRecords() for name in RECORD_COLLECTIONS},
+            {name: MemoryInbox() for name in INBOX_COLLECTIONS},
+        )
+
+    async def raise_sequence(self, name: str, value: int) -> None:
+        self._sequences[name] = max(self._sequences.get(name, 0), value)
+
+    async def next_sequence(self, name: str) -> int:
+        self._sequences[name] = self._sequences.get(name, 0) + 1
+        return self._sequences[name]
+
+
+STORAGE_BACKENDS = ("mongo", "sqlite", "memory")
+
+
+def open_storage(backend: str, *, mongo_url: Optional[str] = None, db_name: Optional[str] = None,
+                 sqlite_path: Optional[Path] = None, event_listeners=()) -> Storage:
+    """Create the storage named by ``backend`` (one of ``STORAGE_BACKENDS``)"""
+    if backend == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+        # tz_aware so BSON dates come back as UTC-aware datetimes
+        client = AsyncIOMotorClient(mongo_url, tz_aware=True, event_listeners=list(event_listeners))
+        return MongoStorage(client[db_name])
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path)
+    if backend == "memory":
+        return MemoryStorage()
+    raise ValueError(f"Unknown storage backend {backend!r}; expected one of {', '.join(STORAGE_BACKENDS)}")
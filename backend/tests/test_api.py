@@ -5,6 +5,11 @@ Tests: Admin auth, File uploads, Projects, Skills, Config, Contact, and URL pars
 import pytest
 import requests
 import os
+import uuid
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
@@ -101,6 +106,80 @@ class TestFileUploads:
             file_response = requests.get(f"{BASE_URL}{img_url}")
             assert file_response.status_code == 200
             print(f"✅ File accessible at: {img_url}")
+    
+    def test_duplicate_upload_is_reference_counted(self):
+        """Test identical uploads share one file that is removed only with the last reference"""
+        test_content = f"dedup test {uuid.uuid4()}".encode()
+        files = {"file": ("dup.jpg", test_content, "image/jpeg")}
+        
+        first = requests.post(f"{BASE_URL}/api/upload", files=files).json()
+        second = requests.post(f"{BASE_URL}/api/upload", files=files).json()
+        if second["url"] != first["url"]:
+            pytest.skip("Content-addressed uploads are disabled")
+        assert first["deduplicated"] is False and first["references"] == 1
+        assert second["deduplicated"] is True and second["references"] == 2
+        
+        delete_url = f"{BASE_URL}/api/media/{first['url'].removeprefix('/api/uploads/')}"
+        response = requests.delete(delete_url)
+        assert response.status_code == 200
+        assert response.json()["references"] == 1
+        assert requests.get(f"{BASE_URL}{first['url']}").status_code == 200
+        
+        response = requests.delete(delete_url)
+        assert response.status_code == 200
+        assert response.json()["references"] == 0
+        assert requests.get(f"{BASE_URL}{first['url']}").status_code == 404
+        print(f"✅ Shared file removed with its last reference: {first['url']}")
+    
+    def test_duplicate_upload_racing_last_delete_keeps_file(self):
+        """Test a duplicate upload concurrent with the last reference's delete never returns a dead URL"""
+        files = {"file": ("race.jpg", f"dedup race {uuid.uuid4()}".encode(), "image/jpeg")}
+        url = requests.post(f"{BASE_URL}/api/upload", files=files).json()["url"]
+        delete_url = f"{BASE_URL}/api/media/{url.removeprefix('/api/uploads/')}"
+        
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                for _ in range(20):
+                    deleted = pool.submit(requests.delete, delete_url)
+                    uploaded = pool.submit(requests.post, f"{BASE_URL}/api/upload", files=files)
+                    assert deleted.result().status_code in (200, 404)
+                    assert uploaded.result().status_code == 200
+                    # Whichever ran first, the upload's reference must point at a stored file
+                    assert requests.get(f"{BASE_URL}{url}").status_code == 200
+        finally:
+            while requests.delete(delete_url).status_code == 200:
+                pass
+        print(f"✅ {url} survived 20 delete/upload races")
+    
+    def test_resized_variant_is_not_cached_before_it_exists(self):
+        """Test ?w= serves the original as no-cache until the variant is written, then the variant as immutable"""
+        image = Image.new("RGB", (1000, 600), tuple(uuid.uuid4().bytes[:3]))
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=95)
+        original = buffer.getvalue()
+        uploaded = requests.post(f"{BASE_URL}/api/upload", files={"file": ("wide.jpg", original, "image/jpeg")}).json()
+        
+        try:
+            deadline = time.time() + 10
+            while True:
+                response = requests.get(f"{BASE_URL}{uploaded['url']}?w=320", headers={"Accept": "image/jpeg"})
+                assert response.status_code == 200
+                if response.content != original:
+                    break
+                assert response.headers["Cache-Control"] == "no-cache"
+                assert time.time() < deadline, "variant was never generated"
+                time.sleep(0.1)
+            
+            assert "immutable" in response.headers["Cache-Control"]
+            with Image.open(io.BytesIO(response.content)) as variant:
+                assert variant.width == 320
+            
+            full = requests.get(f"{BASE_URL}{uploaded['url']}")
+            assert full.content == original
+            assert "immutable" in full.headers["Cache-Control"]
+        finally:
+            requests.delete(f"{BASE_URL}/api/media/{uploaded['url'].removeprefix('/api/uploads/')}")
+        print(f"✅ 320w variant served as immutable: {len(response.content)} of {len(original)} bytes")
 
 
 class TestProjects:
@@ -0,0 +1,473 @@
+"""
+Backend API Tests for ORBYA Portfolio - Performance
+Tests: JSON document cache, ETag revalidation, project pagination/filtering,
+byte-range file serving, bootstrap aggregation, quote of the day, contact inbox paging, /metrics exposition, full-text search, change feed, record snapshots,
+incremental JSON sync, response compression, storage backends (run with the server on STORAGE_BACKEND=mongo, sqlite and memory)
+"""
+import pytest
+import requests
+import os
+import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+class TestDocumentCache:
+    """data/*.json document cache tests"""
+    
+    def test_cache_stats_counts_hits(self):
+        """Test repeated reads of the same document are served from the cache"""
+        requests.get(f"{BASE_URL}/api/stats")
+        before = requests.get(f"{BASE_URL}/api/cache/stats").json()
+        
+        requests.get(f"{BASE_URL}/api/stats")
+        after = requests.get(f"{BASE_URL}/api/cache/stats").json()
+        
+        assert after["hits"] > before["hits"]
+        assert "stats.json" in after["documents"]
+        print(f"✅ Cache hit ratio: {after['hit_ratio']}")
+
+
+
+class TestConditionalGet:
+    """ETag / If-None-Match tests for read endpoints"""
+    
+    @pytest.mark.parametrize("path", ["/api/projects", "/api/skills", "/api/stats", "/api/config", "/api/quotes"])
+    def test_matching_etag_returns_304(self, path):
+        """Test a repeated request with the returned ETag is answered with 304"""
+        response = requests.get(f"{BASE_URL}{path}")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag
+        
+        cached = requests.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        print(f"✅ {path} revalidated with {etag}")
+
+
+
+class TestProjectQueries:
+    """Filtering, projection and cursor pagination on GET /api/projects"""
+    
+    def test_featured_filter_with_projection(self):
+        """Test featured filter only returns featured projects with requested fields"""
+        response = requests.get(f"{BASE_URL}/api/projects?featured=true&fields=title,featured")
+        assert response.status_code == 200
+        data = response.json()
+        for p in data:
+            assert p["featured"] is True
+            assert set(p) == {"id", "title", "featured"}
+        print(f"✅ {len(data)} featured projects")
+    
+    def test_cursor_pagination_walks_all_projects(self):
+        """Test following X-Next-Cursor visits every project exactly once"""
+        all_ids = sorted(p["id"] for p in requests.get(f"{BASE_URL}/api/projects").json())
+        
+        seen = []
+        url = f"{BASE_URL}/api/projects?limit=2&fields=id"
+        while url:
+            response = requests.get(url)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen.extend(p["id"] for p in page)
+            cursor = response.headers.get("X-Next-Cursor")
+            url = f"{BASE_URL}/api/projects?limit=2&fields=id&cursor={cursor}" if cursor else None
+        
+        assert seen == all_ids
+        print(f"✅ Paginated through {len(seen)} projects")
+    
+    def test_unknown_field_rejected(self):
+        """Test projection on an unknown field returns 400"""
+        response = requests.get(f"{BASE_URL}/api/projects?fields=notAField")
+        assert response.status_code == 400
+
+
+
+class TestCollectionSync:
+    """Incremental JSON -> storage sync tests"""
+    
+    def test_second_sync_changes_nothing(self):
+        """Test re-syncing unchanged JSON reports every record as unchanged"""
+        first = requests.post(f"{BASE_URL}/api/projects/sync")
+        if first.status_code == 404:
+            pytest.skip("No projects.json")
+        assert first.status_code == 200
+        
+        second = requests.post(f"{BASE_URL}/api/projects/sync").json()
+        assert second["unchanged"] == second["total"]
+        assert second["inserted"] == second["updated"] == second["deleted"] == 0
+        assert set(second["timings_ms"]) == {"read", "diff", "write"}
+        print(f"✅ Second sync left {second['unchanged']} projects unchanged")
+
+
+class TestRangeRequests:
+    """Range and conditional GET tests for file downloads"""
+    
+    def test_resume_single_range(self):
+        """Test a single byte range returns 206 with the requested bytes"""
+        response = requests.get(f"{BASE_URL}/api/resume/download", headers={"Range": "bytes=0-3"})
+        if response.status_code == 404:
+            pytest.skip("Resume not present")
+        assert response.status_code == 206
+        assert response.content == b"%PDF"
+        assert response.headers["Content-Range"].startswith("bytes 0-3/")
+        print(f"✅ Range served: {response.headers['Content-Range']}")
+    
+    def test_resume_revalidates_with_etag(self):
+        """Test the resume can be revalidated with its ETag"""
+        response = requests.get(f"{BASE_URL}/api/resume/download")
+        if response.status_code == 404:
+            pytest.skip("Resume not present")
+        assert response.headers.get("Accept-Ranges") == "bytes"
+        
+        cached = requests.get(
+            f"{BASE_URL}/api/resume/download",
+            headers={"If-None-Match": response.headers["ETag"]}
+        )
+        assert cached.status_code == 304
+        print("✅ Resume revalidated with 304")
+    
+    def test_unsatisfiable_range(self):
+        """Test a range past the end of the file returns 416"""
+        response = requests.get(
+            f"{BASE_URL}/api/resume/download",
+            headers={"Range": "bytes=999999999-"}
+        )
+        if response.status_code == 404:
+            pytest.skip("Resume not present")
+        assert response.status_code == 416
+    
+    @pytest.mark.parametrize("header", ["bytes=5-abc", "bytes=abc-5", "bytes=-", "bytes=1-x,0-3"])
+    def test_malformed_range_is_ignored(self, header):
+        """Test a Range with a non-numeric bound is ignored and the whole file is sent"""
+        full = requests.get(f"{BASE_URL}/api/resume/download")
+        if full.status_code == 404:
+            pytest.skip("Resume not present")
+        
+        response = requests.get(f"{BASE_URL}/api/resume/download", headers={"Range": header})
+        assert response.status_code == 200
+        assert response.content == full.content
+        print(f"✅ '{header}' ignored")
+
+
+
+class TestCompression:
+    """Brotli/gzip response encoding and precompressed static files"""
+    
+    def test_large_json_is_compressed(self):
+        """Test a JSON response over the size threshold is encoded with the client's preferred encoding"""
+        identity = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in identity.headers
+        if len(identity.content) < 1024:
+            pytest.skip("Bootstrap payload below the compression threshold")
+        
+        for encoding in ("br", "gzip"):
+            response = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": encoding})
+            if encoding == "br" and response.headers.get("Content-Encoding") == "gzip":
+                continue  # Brotli not installed on the server
+            assert response.headers["Content-Encoding"] == encoding
+            assert "Accept-Encoding" in response.headers["Vary"]
+            assert response.json() == identity.json()
+            print(f"✅ {encoding}: {response.headers['Content-Length']} of {len(identity.content)} bytes")
+    
+    @pytest.mark.parametrize("encoding", ["br", "gzip"])
+    def test_encoded_etag_revalidates(self, encoding):
+        """Test revalidating with the -br/-gzip ETag of a compressed response returns 304 with that ETag"""
+        response = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": encoding})
+        etag = response.headers["ETag"]
+        if not etag.endswith(f'-{encoding}"'):
+            pytest.skip(f"Response not {encoding}-encoded")
+        
+        cached = requests.get(
+            f"{BASE_URL}/api/bootstrap",
+            headers={"Accept-Encoding": encoding, "If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+    
+    def test_concurrent_compressed_responses(self):
+        """Test many concurrent requests across encodings all decode to the same body"""
+        expected = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": "identity"}).json()
+        
+        def fetch(i):
+            encoding = ("br", "gzip")[i % 2]
+            return requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": encoding}).json()
+        
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            bodies = list(pool.map(fetch, range(64)))
+        assert all(body == expected for body in bodies)
+    
+    @pytest.mark.parametrize("path", ["/static/ORBYA_Resume.pdf", "/api/resume/download"])
+    def test_range_on_precompressed_file_is_identity(self, path):
+        """Test a Range request for a file with .br/.gz siblings gets identity bytes, never compressed ones"""
+        identity = requests.get(f"{BASE_URL}{path}", headers={"Accept-Encoding": "identity"})
+        if identity.status_code == 404:
+            pytest.skip("Resume not present")
+        
+        # Siblings are written in the background at startup
+        deadline = time.time() + 10
+        while "Content-Encoding" not in requests.get(f"{BASE_URL}{path}", headers={"Accept-Encoding": "gzip"}).headers:
+            if time.time() > deadline:
+                pytest.skip("No precompressed sibling")
+            time.sleep(0.2)
+        
+        response = requests.get(f"{BASE_URL}{path}", headers={"Accept-Encoding": "br, gzip", "Range": "bytes=0-3"})
+        assert response.status_code in (200, 206)
+        assert "Content-Encoding" not in response.headers
+        assert response.content.startswith(b"%PDF")
+        assert identity.content.startswith(response.content)
+        print(f"✅ {path} range served as identity ({response.status_code})")
+
+
+
+class TestBootstrap:
+    """Aggregated /api/bootstrap endpoint tests"""
+    
+    def test_bootstrap_selected_sections(self):
+        """Test include= returns exactly the requested sections"""
+        response = requests.get(f"{BASE_URL}/api/bootstrap?include=skills,stats")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"skills", "stats"}
+        assert isinstance(data["skills"], list)
+        print(f"✅ Bootstrap returned {len(data['skills'])} skills and {len(data['stats'])} stats")
+    
+    def test_bootstrap_unknown_section(self):
+        """Test an unknown section name is rejected"""
+        response = requests.get(f"{BASE_URL}/api/bootstrap?include=skills,nope")
+        assert response.status_code == 400
+
+
+
+class TestQuoteOfTheDay:
+    """Cached /api/quote tests"""
+    
+    def test_quote_for_explicit_date_is_stable(self):
+        """Test the same date always resolves to the same quote"""
+        first = requests.get(f"{BASE_URL}/api/quote?date=2024-01-01")
+        second = requests.get(f"{BASE_URL}/api/quote?date=2024-01-01")
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        print(f"✅ Quote for 2024-01-01: {first.json()['author']}")
+    
+    def test_today_cached_until_midnight(self):
+        """Test today's quote carries a max-age and rejects unknown timezones"""
+        response = requests.get(f"{BASE_URL}/api/quote?tz=Europe/London")
+        assert response.status_code == 200
+        assert "max-age=" in response.headers.get("Cache-Control", "")
+        
+        response = requests.get(f"{BASE_URL}/api/quote?tz=Not/AZone")
+        assert response.status_code == 400
+
+
+
+class TestContactInbox:
+    """Keyset-paginated /api/contact tests"""
+    
+    def test_pages_are_newest_first_without_overlap(self):
+        """Test following X-Next-Cursor walks older messages without repeats"""
+        for i in range(3):
+            requests.post(f"{BASE_URL}/api/contact", json={
+                "name": f"TEST_Pager {i}", "email": "pager@example.com",
+                "subject": "Paging", "message": "Cursor pagination test",
+            })
+        
+        first = requests.get(f"{BASE_URL}/api/contact?limit=2")
+        assert first.status_code == 200
+        cursor = first.headers.get("X-Next-Cursor")
+        assert cursor
+        second = requests.get(f"{BASE_URL}/api/contact", params={"limit": 2, "cursor": cursor})
+        assert second.status_code == 200
+        
+        page = first.json() + second.json()
+        assert len({m["id"] for m in page}) == len(page)
+        stamps = [m["timestamp"] for m in page]
+        assert stamps == sorted(stamps, reverse=True)
+        print(f"✅ Walked {len(page)} messages across two pages")
+    
+    def test_ndjson_export(self):
+        """Test the streaming export returns one JSON document per line"""
+        response = requests.get(f"{BASE_URL}/api/contact?format=ndjson", stream=True)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        lines = [line for line in response.iter_lines() if line]
+        assert all(line.startswith(b"{") for line in lines)
+        print(f"✅ Exported {len(lines)} messages")
+
+
+
+class TestMetrics:
+    """Prometheus /metrics endpoint tests"""
+    
+    def test_route_latency_histogram(self):
+        """Test requests are recorded under their route template"""
+        requests.get(f"{BASE_URL}/api/projects/1")
+        response = requests.get(f"{BASE_URL}/metrics")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        
+        text = response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/projects/{project_id}"' in text
+        assert "# TYPE cache_hit_ratio gauge" in text
+        print(f"✅ Metrics exposition is {len(text)} bytes")
+
+
+
+class TestSearch:
+    """In-memory /api/search index tests"""
+    
+    def test_prefix_query_finds_project(self):
+        """Test a word prefix matches and results are ranked by score"""
+        projects = requests.get(f"{BASE_URL}/api/projects").json()
+        if not projects:
+            pytest.skip("No projects")
+        word = projects[0]["title"].split()[0].lower()
+        
+        response = requests.get(f"{BASE_URL}/api/search", params={"q": word[:4], "type": "project"})
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert projects[0]["id"] in [r["id"] for r in results]
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+        print(f"✅ '{word[:4]}' matched {len(results)} projects")
+    
+    def test_search_tracks_project_writes(self):
+        """Test created, updated and deleted projects are reflected immediately"""
+        payload = {
+            "title": "TEST_Searchable Quokka Reel", "category": "Test", "description": "Index test",
+            "thumbnail": "", "videoUrl": "", "featured": False, "tags": [], "year": 2024, "aspectRatio": "16:9",
+        }
+        project_id = requests.post(f"{BASE_URL}/api/projects", json=payload).json()["id"]
+        try:
+            found = requests.get(f"{BASE_URL}/api/search?q=quokka").json()["results"]
+            assert project_id in [r["id"] for r in found]
+        finally:
+            requests.delete(f"{BASE_URL}/api/projects/{project_id}")
+        
+        found = requests.get(f"{BASE_URL}/api/search?q=quokka").json()["results"]
+        assert project_id not in [r["id"] for r in found]
+
+
+
+class TestChangeFeed:
+    """Server-sent /api/changes tests"""
+    
+    def test_stats_update_is_pushed(self):
+        """Test a write is delivered to an open subscriber as a versioned delta"""
+        stats = requests.get(f"{BASE_URL}/api/stats").json()
+        
+        with requests.get(f"{BASE_URL}/api/changes?types=stats", stream=True, timeout=10) as stream:
+            assert stream.headers["Content-Type"].startswith("text/event-stream")
+            lines = stream.iter_lines(decode_unicode=True)
+            assert next(lines).startswith("id: ")
+            assert next(lines) == "event: ready"
+            
+            requests.put(f"{BASE_URL}/api/stats", json=stats)
+            event = next(line for line in lines if line == "event: change")
+            data = next(lines)
+        
+        assert event == "event: change"
+        assert '"type":"stats"' in data and '"op":"upsert"' in data
+        print(f"✅ Received change event: {data[:60]}...")
+    
+    def test_unknown_type_rejected(self):
+        """Test subscribing to an unknown change type is rejected"""
+        response = requests.get(f"{BASE_URL}/api/changes?types=nope")
+        assert response.status_code == 400
+
+
+
+class TestRecordSnapshots:
+    """In-process projects/skills snapshot tests"""
+    
+    def test_repeated_reads_hit_snapshot(self):
+        """Test project reads after the first are served from the snapshot"""
+        requests.get(f"{BASE_URL}/api/projects")
+        before = requests.get(f"{BASE_URL}/api/cache/stats").json()["snapshots"]["projects"]
+        
+        requests.get(f"{BASE_URL}/api/projects")
+        requests.get(f"{BASE_URL}/api/projects?featured=true")
+        after = requests.get(f"{BASE_URL}/api/cache/stats").json()["snapshots"]["projects"]
+        
+        assert after["loaded"] is True
+        assert after["hits"] >= before["hits"] + 2
+        print(f"✅ Snapshot v{after['version']}: {after['hits']} hits, {after['misses']} misses")
+    
+    def test_writes_swap_snapshot(self):
+        """Test an update is visible on the next read and bumps the version"""
+        payload = {
+            "title": "TEST_Snapshot Reel", "category": "Test", "description": "Snapshot test",
+            "thumbnail": "", "videoUrl": "", "featured": False, "tags": [], "year": 2024, "aspectRatio": "16:9",
+        }
+        project_id = requests.post(f"{BASE_URL}/api/projects", json=payload).json()["id"]
+        try:
+            version = requests.get(f"{BASE_URL}/api/cache/stats").json()["snapshots"]["projects"]["version"]
+            requests.put(f"{BASE_URL}/api/projects/{project_id}", json={**payload, "title": "TEST_Snapshot Edited"})
+            
+            assert requests.get(f"{BASE_URL}/api/projects/{project_id}").json()["title"] == "TEST_Snapshot Edited"
+            titles = [p["title"] for p in requests.get(f"{BASE_URL}/api/projects").json()]
+            assert "TEST_Snapshot Edited" in titles
+            assert requests.get(f"{BASE_URL}/api/cache/stats").json()["snapshots"]["projects"]["version"] > version
+        finally:
+            requests.delete(f"{BASE_URL}/api/projects/{project_id}")
+        
+        assert requests.get(f"{BASE_URL}/api/projects/{project_id}").status_code == 404
+
+
+class TestStorageBackend:
+    """Inbox keyset paging and id allocation, whichever STORAGE_BACKEND the server runs"""
+    
+    def test_inbox_keyset_walks_every_entry_once(self):
+        """Test walking /api/status by cursor returns each check once, newest first"""
+        marker = f"TEST_Keyset {uuid.uuid4().hex[:8]}"
+        posted = {requests.post(f"{BASE_URL}/api/status", json={"client_name": marker}).json()["id"] for _ in range(7)}
+        
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = requests.get(f"{BASE_URL}/api/status", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 3
+            seen.extend(page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        
+        ids = [s["id"] for s in seen]
+        assert len(ids) == len(set(ids))
+        assert posted <= set(ids)
+        keys = [(datetime.fromisoformat(s["timestamp"].replace("Z", "+00:00")), s["id"]) for s in seen]
+        assert keys == sorted(keys, reverse=True)
+        print(f"✅ Walked {len(ids)} status checks in pages of 3")
+    
+    def test_project_ids_are_unique_and_never_reused(self):
+        """Test concurrent creates get distinct new ids, and a deleted id is not handed out again"""
+        existing = max((p["id"] for p in requests.get(f"{BASE_URL}/api/projects").json()), default=0)
+        payload = {
+            "title": "TEST_Id Allocation", "category": "Test", "description": "Sequence test",
+            "thumbnail": "", "videoUrl": "", "featured": False, "tags": [], "year": 2024, "aspectRatio": "16:9",
+        }
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            created = list(pool.map(lambda _: requests.post(f"{BASE_URL}/api/projects", json=payload).json()["id"], range(5)))
+        try:
+            assert len(set(created)) == 5
+            assert min(created) > existing
+            
+            requests.delete(f"{BASE_URL}/api/projects/{max(created)}")
+            again = requests.post(f"{BASE_URL}/api/projects", json=payload).json()["id"]
+            created.append(again)
+            assert again > max(created[:-1])
+        finally:
+            for project_id in created:
+                requests.delete(f"{BASE_URL}/api/projects/{project_id}")
+        print(f"✅ Allocated ids {sorted(created)}")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,307 @@
+"""
+Backend unit tests for ORBYA Portfolio - in-process internals
+Tests: media catalog rescans, file modes of atomically replaced files,
+cross-worker document updates, generation counters and write-behind
+batching, spilling and replay. Runs without a
+server; STORAGE_BACKEND is set before importing server so no database
+connection is needed.
+"""
+import pytest
+import asyncio
+import io
+import json
+import os
+import stat
+import sys
+import threading
+from pathlib import Path
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image
+from starlette.datastructures import UploadFile
+from datetime import datetime, timezone
+import server
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the data/*.json document cache at an empty directory"""
+    directory = tmp_path / "data"
+    directory.mkdir()
+    monkeypatch.setattr(server, "documents", server.DocumentCache(directory))
+    return directory
+
+
+def _write_image(path: Path) -> None:
+    Image.new("RGB", (8, 8), "white").save(path, "PNG")
+
+
+class TestMediaCatalog:
+    """data/media_catalog.json bookkeeping"""
+    
+    def test_upload_before_first_listing_keeps_files_on_disk(self, tmp_path, data_dir):
+        """Test files already on disk stay listed when an upload comes before the first scan"""
+        images = tmp_path / "uploads" / "images"
+        images.mkdir(parents=True)
+        for i in range(6):
+            _write_image(images / f"existing-{i}.png")
+        catalog = server.MediaCatalog(tmp_path / "uploads")
+        
+        previous = catalog.dir_mtime("images")
+        _write_image(images / "uploaded.png")
+        catalog.add("images", images / "uploaded.png", None, previous)
+        catalog.refresh()
+        
+        names = {e["filename"] for e in catalog.listing("images")}
+        assert names == {f"existing-{i}.png" for i in range(6)} | {"uploaded.png"}
+        print(f"✅ Listed {len(names)} images after an upload on an unscanned directory")
+    
+    def test_upload_after_scan_skips_rescan(self, tmp_path, data_dir):
+        """Test an upload into a scanned directory records its mtime, so the next listing does not rescan"""
+        images = tmp_path / "uploads" / "images"
+        images.mkdir(parents=True)
+        _write_image(images / "existing.png")
+        catalog = server.MediaCatalog(tmp_path / "uploads")
+        catalog.refresh()
+        
+        previous = catalog.dir_mtime("images")
+        _write_image(images / "uploaded.png")
+        catalog.add("images", images / "uploaded.png", None, previous)
+        assert catalog._dir_mtimes["images"] == catalog.dir_mtime("images")
+        
+        previous = catalog.dir_mtime("images")
+        (images / "existing.png").unlink()
+        catalog.remove("images", "existing.png", previous)
+        catalog.refresh()
+        assert [e["filename"] for e in catalog.listing("images")] == ["uploaded.png"]
+
+
+
+class TestFileModes:
+    """Files written through a temp file and rename follow the umask, like a plain open()"""
+    
+    def test_json_document_mode(self, tmp_path):
+        """Test data/*.json documents are not left owner-only by mkstemp"""
+        path = tmp_path / "stats.json"
+        server._atomic_write_json(path, [])
+        assert stat.S_IMODE(path.stat().st_mode) == server.FILE_MODE
+        print(f"✅ stats.json written as {oct(server.FILE_MODE)}")
+    
+    def test_upload_mode(self, tmp_path):
+        """Test streamed uploads are not left owner-only by mkstemp"""
+        upload = UploadFile(io.BytesIO(b"upload mode test"), filename="mode.jpg")
+        temp_path, size, _ = asyncio.run(server._stream_to_temp(upload, tmp_path))
+        assert size == 16
+        assert stat.S_IMODE(temp_path.stat().st_mode) == server.FILE_MODE
+
+
+
+class TestDocumentUpdates:
+    """DocumentCache.update read-modify-writes under the cross-process file lock"""
+    
+    def test_two_workers_lose_no_updates(self, tmp_path):
+        """Test concurrent increments from two caches over one directory all land"""
+        workers = [server.DocumentCache(tmp_path) for _ in range(2)]
+        
+        def increment(doc: dict) -> dict:
+            return {**doc, "count": doc.get("count", 0) + 1}
+        
+        def run(cache):
+            async def main():
+                await asyncio.gather(*(cache.update("counter.json", increment, {}) for _ in range(50)))
+            asyncio.run(main())
+        
+        threads = [threading.Thread(target=run, args=(cache,)) for cache in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert json.loads((tmp_path / "counter.json").read_text())["count"] == 100
+        assert all(cache.load_sync("counter.json")["count"] == 100 for cache in workers)
+        print("✅ 100 increments from two workers, none lost")
+
+
+class TestWorkerGenerations:
+    """Change counters shared between workers through one memory-mapped file"""
+    
+    def _pair(self, path: Path):
+        changes = ([], [])
+        workers = [
+            server.WorkerGenerations(True, path, ["project", "media"], 0.1, seen.append)
+            for seen in changes
+        ]
+        for worker in workers:
+            worker.open()
+        return workers, changes
+    
+    def test_bump_is_seen_by_other_worker(self, tmp_path):
+        """Test a bump in one worker is reported once by the other's poll, and never to itself"""
+        (first, second), (first_changes, second_changes) = self._pair(tmp_path / "generations")
+        try:
+            first.bump("media")
+            first.poll()
+            second.poll()
+            second.poll()
+            assert first_changes == []
+            assert second_changes == ["media"]
+        finally:
+            asyncio.run(first.stop())
+            asyncio.run(second.stop())
+        print("✅ media bump seen by the other worker")
+    
+    def test_bump_reports_change_missed_since_last_poll(self, tmp_path):
+        """Test a worker bumping a counter the other moved since its last poll still drops its own cache"""
+        (first, second), (first_changes, second_changes) = self._pair(tmp_path / "generations")
+        try:
+            second.bump("project")
+            first.bump("project")
+            assert first_changes == ["project"]
+            
+            second.poll()
+            assert second_changes == ["project"]
+        finally:
+            asyncio.run(first.stop())
+            asyncio.run(second.stop())
+    
+    def test_disabled_is_a_no_op(self, tmp_path):
+        """Test nothing is created or reported unless enabled"""
+        worker = server.WorkerGenerations(False, tmp_path / "generations", ["project"], 0.1, pytest.fail)
+        worker.open()
+        worker.bump("project")
+        worker.poll()
+        assert not (tmp_path / "generations").exists()
+
+
+
+class FakeInbox:
+    """Inbox whose add_many records each batch, or fails like an unreachable database"""
+    
+    def __init__(self, backend):
+        self.backend = backend
+    
+    async def add_many(self, docs):
+        if self.backend.down:
+            raise server.StorageUnavailable("connection refused")
+        await asyncio.sleep(self.backend.delay)
+        self.backend.batches.append([doc["id"] for doc in docs])
+        return 0
+
+
+class FakeStorage:
+    def __init__(self):
+        self.down = False
+        self.delay = 0
+        self.batches = []
+    
+    def inbox(self, name):
+        return FakeInbox(self)
+    
+    def stored(self):
+        return sorted(doc_id for batch in self.batches for doc_id in batch)
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    backend = FakeStorage()
+    monkeypatch.setattr(server, "storage", backend)
+    return backend
+
+
+def _message(i: int) -> dict:
+    return {"id": f"msg-{i}", "name": "TEST_WriteBehind", "timestamp": datetime.now(timezone.utc)}
+
+
+class TestWriteBehind:
+    """Buffered inbox inserts against a storage that can be taken down"""
+    
+    def test_full_batch_flushes_and_stop_flushes_rest(self, tmp_path, fake_storage):
+        """Test a full batch is written in one insert_many and the remainder on shutdown"""
+        async def main():
+            buffer = server.WriteBehind(True, 3, 60, tmp_path / "write_behind.log")
+            buffer.start()
+            for i in range(3):
+                await buffer.insert("contact_messages", _message(i))
+            await asyncio.sleep(0.05)
+            assert fake_storage.batches == [["msg-0", "msg-1", "msg-2"]]
+            
+            await buffer.insert("contact_messages", _message(3))
+            await asyncio.sleep(0.05)
+            assert buffer.pending() == 1
+            await buffer.stop()
+            assert buffer.pending() == 0
+            return buffer.stats()
+        
+        stats = asyncio.run(main())
+        assert fake_storage.batches[1:] == [["msg-3"]]
+        assert stats["flushed"] == 4
+        print(f"✅ Batches written: {fake_storage.batches}")
+    
+    def test_stop_waits_for_flush_in_progress(self, tmp_path, fake_storage):
+        """Test stopping while a slow batch is being written loses nothing"""
+        fake_storage.delay = 0.05
+        
+        async def main():
+            buffer = server.WriteBehind(True, 1, 60, tmp_path / "write_behind.log")
+            buffer.start()
+            for i in range(5):
+                await buffer.insert("contact_messages", _message(i))
+                await asyncio.sleep(0)
+            await buffer.stop()
+        
+        asyncio.run(main())
+        assert fake_storage.stored() == [f"msg-{i}" for i in range(5)]
+    
+    def test_failed_batch_spills_and_replays_on_next_flush(self, tmp_path, fake_storage):
+        """Test a batch the database rejects goes to the spill log and is re-inserted once writes succeed"""
+        spill = tmp_path / "write_behind.log"
+        
+        async def main():
+            buffer = server.WriteBehind(True, 100, 60, spill)
+            fake_storage.down = True
+            for i in range(2):
+                await buffer.insert("contact_messages", _message(i))
+            await buffer.flush()
+            assert len(spill.read_text().splitlines()) == 2
+            assert buffer.stats()["spilled"] == 2
+            
+            fake_storage.down = False
+            await buffer.insert("contact_messages", _message(2))
+            await buffer.flush()
+        
+        asyncio.run(main())
+        assert fake_storage.stored() == ["msg-0", "msg-1", "msg-2"]
+        assert not spill.exists()
+        print("✅ Spilled batch replayed after the database came back")
+    
+    def test_spill_log_replayed_at_startup(self, tmp_path, fake_storage, monkeypatch):
+        """Test documents spilled before a restart are inserted by the startup hook"""
+        spill = tmp_path / "write_behind.log"
+        fake_storage.down = True
+        
+        async def crash():
+            buffer = server.WriteBehind(True, 100, 60, spill)
+            await buffer.insert("status_checks", _message(0))
+            await buffer.stop()
+        
+        asyncio.run(crash())
+        assert spill.exists() and fake_storage.batches == []
+        
+        fake_storage.down = False
+        restarted = server.WriteBehind(True, 100, 60, spill)
+        monkeypatch.setattr(server, "write_behind", restarted)
+        monkeypatch.setattr(server, "WRITE_BEHIND_SPILL", spill)
+        
+        async def restart():
+            await server.start_write_behind()
+            await restarted.stop()
+        
+        asyncio.run(restart())
+        assert fake_storage.batches == [["msg-0"]]
+        assert not spill.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -14,6 +14,12 @@ function isDirectVideoUrl(url) {
          url.includes('/uploads/videos/');
 }
 
+// Uploaded images have resized variants available through ?w=
+function getUploadSrcSet(src) {
+  if (!src || !src.includes('/api/uploads/images/')) return undefined;
+  return [320, 640, 1280].map(w => `${src}?w=${w} ${w}w`).join(', ');
+}
+
 function ProjectCard({ project, index, onPlayClick }) {
   const [imageError, setImageError] = useState(false);
   const videoThumbRef = useRef(null);
@@ -74,6 +80,8 @@ function ProjectCard({ project, index, onPlayClick }) {
           ) : thumbnailSrc && !imageError ? (
             <img
               src={thumbnailSrc}
+              srcSet={getUploadSrcSet(thumbnailSrc)}
+              sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
               alt={project.title}
               className="w-full h-full object-cover transition-transform duration-500 group-hover:scale-105"
               onError={() => setImageError(true)}
@@ -0,0 +1,59 @@
+import { useEffect, useRef } from 'react';
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+
+// One EventSource per tab, shared by every component that subscribes.
+// The browser reconnects on its own and resends Last-Event-ID, so missed
+// changes are replayed by the server (or a reset is sent if too many were missed).
+const listeners = new Set();
+let source = null;
+
+function dispatch(event) {
+  listeners.forEach((listener) => listener(event));
+}
+
+function openSource() {
+  if (source || typeof EventSource === 'undefined') return;
+  source = new EventSource(`${BACKEND_URL}/api/changes`);
+  source.addEventListener('change', (e) => dispatch(JSON.parse(e.data)));
+  source.addEventListener('reset', () => dispatch({ type: null, op: 'reset' }));
+}
+
+export function isChangeFeedOpen() {
+  return Boolean(source && source.readyState === EventSource.OPEN);
+}
+
+// Calls onChange({ type, op, id, data }) for changes to the given types.
+// op is 'upsert', 'delete' or 'reset'; on 'reset' the caller should refetch.
+export function useChangeFeed(types, onChange) {
+  const handler = useRef(onChange);
+  handler.current = onChange;
+  const key = types.join(',');
+
+  useEffect(() => {
+    const wanted = key.split(',');
+    const listener = (event) => {
+      if (event.type === null || wanted.includes(event.type)) handler.current(event);
+    };
+    listeners.add(listener);
+    openSource();
+    return () => {
+      listeners.delete(listener);
+      if (listeners.size === 0 && source) {
+        source.close();
+        source = null;
+      }
+    };
+  }, [key]);
+}
+
+// Apply an upsert/delete change to a list of records keyed by `id`
+export function applyChange(list, { op, id, data }, idOf = (item) => item.id) {
+  if (op === 'delete') return list.filter((item) => idOf(item) !== id);
+  if (op !== 'upsert') return list;
+  const index = list.findIndex((item) => idOf(item) === id);
+  if (index === -1) return [...list, data];
+  const next = list.slice();
+  next[index] = data;
+  return next;
+}
@@ -1,9 +1,10 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { 
   Lock, Settings, Palette, BarChart3, MessageSquare, 
-  Plus, Trash2, Edit2, Save, X, RefreshCw,
+  Plus, Trash2, Edit2, Save, X, RefreshCw, Download,
   LogOut, Quote, Briefcase, Zap, Upload, Image, Video, Copy, Check, ChevronDown, FolderOpen
 } from 'lucide-react';
+import { useChangeFeed, applyChange, isChangeFeedOpen } from '../hooks/use-change-feed';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 
@@ -306,6 +307,12 @@ function ProjectsManager() {
 
   useEffect(() => { fetchProjects(); }, []);
 
+  // Edits from this and other admin sessions arrive as deltas
+  useChangeFeed(['project'], (change) => {
+    if (change.op === 'reset') fetchProjects();
+    else setProjects(list => applyChange(list, change));
+  });
+
   const existingCategories = [...new Set(projects.map(p => p.category).filter(Boolean))];
 
   const handleSave = async (project) => {
@@ -321,9 +328,10 @@ function ProjectsManager() {
       });
       
       if (response.ok) {
+        const saved = await response.json();
+        setProjects(list => applyChange(list, { op: 'upsert', id: saved.id, data: saved }));
         setSaveStatus('saved');
         setTimeout(() => setSaveStatus(''), 2000);
-        fetchProjects();
         setEditingId(null);
         setShowAdd(false);
         setEditForm({});
@@ -340,7 +348,7 @@ function ProjectsManager() {
     if (!window.confirm('Delete this project?')) return;
     try {
       await fetch(`${BACKEND_URL}/api/projects/${id}`, { method: 'DELETE' });
-      fetchProjects();
+      setProjects(list => applyChange(list, { op: 'delete', id }));
     } catch (err) {
       console.error('Error deleting project:', err);
     }
@@ -567,18 +575,26 @@ function SkillsManager() {
 
   useEffect(() => { fetchSkills(); }, []);
 
+  useChangeFeed(['skill'], (change) => {
+    if (change.op === 'reset') fetchSkills();
+    else setSkills(list => applyChange(list, change));
+  });
+
   const handleSave = async (skill) => {
     try {
       const method = skill.id ? 'PUT' : 'POST';
       const url = skill.id ? `${BACKEND_URL}/api/skills/${skill.id}` : `${BACKEND_URL}/api/skills`;
       
-      await fetch(url, {
+      const response = await fetch(url, {
         method,
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(skill)
       });
       
-      fetchSkills();
+      if (response.ok) {
+        const saved = await response.json();
+        setSkills(list => applyChange(list, { op: 'upsert', id: saved.id, data: saved }));
+      }
       setEditingId(null);
       setShowAdd(false);
       setEditForm({});
@@ -591,7 +607,7 @@ function SkillsManager() {
     if (!window.confirm('Delete this skill?')) return;
     try {
       await fetch(`${BACKEND_URL}/api/skills/${id}`, { method: 'DELETE' });
-      fetchSkills();
+      setSkills(list => applyChange(list, { op: 'delete', id }));
     } catch (err) {
       console.error('Error deleting skill:', err);
     }
@@ -690,13 +706,30 @@ function MediaLibrary() {
 
   useEffect(() => { fetchMedia(); }, []);
 
-  const handleUpload = () => fetchMedia();
+  // Change ids are "<images|videos>/<filename>"; new files go first like the listing
+  useChangeFeed(['media'], (change) => {
+    if (change.op === 'reset') {
+      fetchMedia();
+      return;
+    }
+    const [kind, filename] = change.id.split('/');
+    setMedia(prev => {
+      const rest = (prev[kind] || []).filter(f => f.filename !== filename);
+      return { ...prev, [kind]: change.op === 'upsert' ? [change.data, ...rest] : rest };
+    });
+  });
+
+  // The upload shows up through the change feed; refetch only if it is not connected
+  const handleUpload = () => { if (!isChangeFeedOpen()) fetchMedia(); };
 
   const handleDelete = async (type, filename) => {
     if (!window.confirm('Delete this file?')) return;
     try {
-      await fetch(`${BACKEND_URL}/api/media/${type}/${filename}`, { method: 'DELETE' });
-      fetchMedia();
+      const res = await fetch(`${BACKEND_URL}/api/media/${type}/${filename}`, { method: 'DELETE' });
+      const data = await res.json();
+      if (data.references === 0) {
+        setMedia(prev => ({ ...prev, [type]: (prev[type] || []).filter(f => f.filename !== filename) }));
+      }
     } catch (err) {
       console.error('Error deleting file:', err);
     }
@@ -1045,10 +1078,21 @@ function ColorsManager() {
 // Messages
 function MessagesViewer() {
   const [messages, setMessages] = useState([]);
+  const [cursor, setCursor] = useState(null);
   const [loading, setLoading] = useState(true);
 
+  // Pages arrive newest first; X-Next-Cursor points at the next older page
+  const loadPage = (after) => {
+    const query = after ? `?cursor=${encodeURIComponent(after)}` : '';
+    return fetch(`${BACKEND_URL}/api/contact${query}`).then(async r => {
+      const page = await r.json();
+      setMessages(prev => after ? [...prev, ...page] : page);
+      setCursor(r.headers.get('X-Next-Cursor'));
+    });
+  };
+
   useEffect(() => {
-    fetch(`${BACKEND_URL}/api/contact`).then(r => r.json()).then(d => setMessages(d.reverse())).finally(() => setLoading(false));
+    loadPage(null).finally(() => setLoading(false));
   }, []);
 
   if (loading) return <div className="text-center py-8"><RefreshCw className="w-8 h-8 text-orange-500 animate-spin mx-auto" /></div>;
@@ -1057,7 +1101,10 @@ function MessagesViewer() {
     <div className="space-y-6">
       <div className="flex justify-between items-center">
         <h2 className="text-xl font-['Rajdhani'] font-bold text-white uppercase">Messages ({messages.length})</h2>
-        <button onClick={() => window.location.reload()} className="flex items-center gap-2 px-4 py-2 border border-orange-500/30 text-white font-mono text-sm"><RefreshCw className="w-4 h-4" /> Refresh</button>
+        <div className="flex gap-2">
+          <a href={`${BACKEND_URL}/api/contact?format=ndjson`} className="flex items-center gap-2 px-4 py-2 border border-orange-500/30 text-white font-mono text-sm"><Download className="w-4 h-4" /> Export</a>
+          <button onClick={() => window.location.reload()} className="flex items-center gap-2 px-4 py-2 border border-orange-500/30 text-white font-mono text-sm"><RefreshCw className="w-4 h-4" /> Refresh</button>
+        </div>
       </div>
       {messages.length === 0 ? <p className="text-white/40 font-mono text-center py-8">No messages</p> : (
         <div className="space-y-4">
@@ -1068,6 +1115,7 @@ function MessagesViewer() {
               <p className="text-white/60 font-mono text-sm">{m.message}</p>
             </div>
           ))}
+          {cursor && <button onClick={() => loadPage(cursor)} className="w-full py-2 border border-orange-500/30 text-white font-mono text-sm">Load older messages</button>}
         </div>
       )}
     </div>
@@ -145,14 +145,14 @@ export default function Home() {
     // Fetch featured projects
     const fetchFeaturedProjects = async () => {
       try {
-        const response = await fetch(`${BACKEND_URL}/api/projects`);
-        const data = await response.json();
-        const featured = data.filter(p => p.featured);
-        
+        const fields = 'title,category,year,thumbnail,videoUrl,aspectRatio';
+        const response = await fetch(`${BACKEND_URL}/api/projects?featured=true&limit=3&fields=${fields}`);
+        const featured = await response.json();
+
         // If no featured, pick random ones
-        const projectsToShow = featured.length > 0 
-          ? featured.slice(0, 3) 
-          : data.slice(0, 3);
+        const projectsToShow = featured.length > 0
+          ? featured
+          : await (await fetch(`${BACKEND_URL}/api/projects?limit=3&fields=${fields}`)).json();
         
         setFeaturedProjects(projectsToShow);
         
@@ -32,14 +32,16 @@ export default function Skills() {
   const [stats, setStats] = useState([]);
 
   useEffect(() => {
-    const fetchSkills = async () => {
+    // Skills and stats arrive together in one bootstrap response
+    const fetchSkillsAndStats = async () => {
       try {
-        const response = await fetch(`${BACKEND_URL}/api/skills`);
+        const response = await fetch(`${BACKEND_URL}/api/bootstrap?include=skills,stats`);
         if (!response.ok) {
           throw new Error('Failed to fetch skills');
         }
         const data = await response.json();
-        setSkills(data);
+        setSkills(data.skills);
+        setStats(data.stats);
       } catch (err) {
         console.error('Error fetching skills:', err);
         setError(err.message);
@@ -48,21 +50,7 @@ export default function Skills() {
       }
     };
 
-    const fetchStats = async () => {
-      try {
-        const response = await fetch(`${BACKEND_URL}/api/stats`);
-        if (response.ok) {
-          const data = await response.json();
-          setStats(data);
-        }
-      } catch (err) {
-        // Stats are optional, use defaults if not available
-        console.log('Stats not available, using defaults');
-      }
-    };
-
-    fetchSkills();
-    fetchStats();
+    fetchSkillsAndStats();
   }, []);
 
   // Dynamically group skills by category
@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import GlitchText from '../components/GlitchText';
 import ProjectCard from '../components/ProjectCard';
-import { Film, Archive, Layers, Grid3X3, X, ExternalLink, LayoutGrid, List } from 'lucide-react';
+import { useChangeFeed, applyChange } from '../hooks/use-change-feed';
+import { Film, Archive, Layers, Grid3X3, X, ExternalLink, LayoutGrid, List, Search } from 'lucide-react';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 
@@ -127,34 +128,69 @@ export default function Work() {
   const [filter, setFilter] = useState('all');
   const [viewMode, setViewMode] = useState('masonry'); // 'masonry' or 'grid'
   const [selectedProject, setSelectedProject] = useState(null);
+  const [query, setQuery] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
+
+  const fetchProjects = async () => {
+    try {
+      const response = await fetch(`${BACKEND_URL}/api/projects`);
+      if (!response.ok) {
+        throw new Error('Failed to fetch projects');
+      }
+      const data = await response.json();
+      setProjects(data);
+    } catch (err) {
+      console.error('Error fetching projects:', err);
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  };
 
   useEffect(() => {
-    const fetchProjects = async () => {
+    fetchProjects();
+  }, []);
+
+  // Keep the grid current without refetching the whole list
+  useChangeFeed(['project'], (change) => {
+    if (change.op === 'reset') fetchProjects();
+    else setProjects(list => applyChange(list, change));
+  });
+
+  // Ranked server-side search, debounced while typing
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setSearchResults(null);
+      return;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
       try {
-        const response = await fetch(`${BACKEND_URL}/api/projects`);
-        if (!response.ok) {
-          throw new Error('Failed to fetch projects');
-        }
+        const response = await fetch(
+          `${BACKEND_URL}/api/search?type=project&limit=100&q=${encodeURIComponent(q)}`,
+          { signal: controller.signal }
+        );
         const data = await response.json();
-        setProjects(data);
+        setSearchResults(data.results.map(r => r.item));
       } catch (err) {
-        console.error('Error fetching projects:', err);
-        setError(err.message);
-      } finally {
-        setLoading(false);
+        if (err.name !== 'AbortError') console.error('Error searching projects:', err);
       }
+    }, 150);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
     };
-
-    fetchProjects();
-  }, []);
+  }, [query]);
 
   // Get unique categories dynamically
   const categories = ['all', ...new Set(projects.map(p => p.category).filter(Boolean))];
 
   // Filter projects
+  const visibleProjects = searchResults ?? projects;
   const filteredProjects = filter === 'all' 
-    ? projects 
-    : projects.filter(p => p.category === filter);
+    ? visibleProjects 
+    : visibleProjects.filter(p => p.category === filter);
 
   // Get years range
   const years = projects.map(p => p.year).filter(Boolean);
@@ -248,6 +284,19 @@ export default function Work() {
             ))}
           </div>
 
+          {/* Search */}
+          <div className="flex items-center gap-2 px-3 py-1.5 bg-black/30 border border-[#FF4D00]/30 focus-within:border-[#FF4D00]">
+            <Search className="w-4 h-4 text-[#FF4D00]" strokeWidth={1.5} />
+            <input
+              type="search"
+              value={query}
+              onChange={(e) => setQuery(e.target.value)}
+              placeholder="SEARCH..."
+              className="bg-transparent text-white font-mono text-xs tracking-wider outline-none placeholder-white/30 w-40"
+              data-testid="project-search"
+            />
+          </div>
+
           {/* View Mode Toggle */}
           <div className="flex gap-1">
             <button
@@ -291,7 +340,7 @@ export default function Work() {
             <Grid3X3 className="w-16 h-16 text-[#FF4D00]/30 mx-auto mb-4" strokeWidth={1} />
             <p className="text-[#FF4D00] font-mono text-sm">NO PROJECTS FOUND</p>
             <p className="text-white/40 font-mono text-xs mt-2">
-              {filter !== 'all' ? 'Try a different category filter' : 'No projects found'}
+              {query.trim() ? 'Try a different search' : filter !== 'all' ? 'Try a different category filter' : 'No projects found'}
             </p>
           </div>
         ) : viewMode === 'masonry' ? (